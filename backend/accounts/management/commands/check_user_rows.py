@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from accounts.provisioning import ensure_user_rows
+
+
+class Command(BaseCommand):
+    help = "Create any missing Profile and Cart rows (e.g. for users created without signals)."
+
+    def handle(self, *args, **options):
+        repaired = ensure_user_rows()
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {repaired['profiles']} profile(s) and {repaired['carts']} cart(s)."
+        ))
@@ -0,0 +1,47 @@
+import csv
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.provisioning import ensure_user_rows, provision_users
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk create users (with profiles and carts) from a CSV or JSON file with "
+        "username, email, password, first_name, last_name."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                            help="Processes used to hash passwords.")
+
+    def handle(self, *args, **options):
+        rows = self.read(options["path"])
+        result = provision_users(rows, batch_size=options["batch_size"], workers=options["workers"])
+
+        for index, reason in result["rejected"]:
+            self.stderr.write(f"row {index}: {reason}")
+
+        repaired = ensure_user_rows()
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {result['created']} user(s), rejected {len(result['rejected'])}; "
+            f"filled {repaired['profiles']} missing profile(s) and {repaired['carts']} cart(s)."
+        ))
+
+    def read(self, path):
+        try:
+            with open(path, newline="", encoding="utf-8") as handle:
+                if path.endswith(".json"):
+                    rows = json.load(handle)
+                else:
+                    rows = list(csv.DictReader(handle))
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Could not read {path}: {e}")
+
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise CommandError("Expected a list of user objects")
+        return rows
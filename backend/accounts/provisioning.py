@@ -0,0 +1,153 @@
+"""
+Bulk user provisioning.
+
+Creating users one by one through create_user costs a password hash plus
+three INSERTs (the user, then a Profile and a Cart from post_save
+receivers) and a search document per user. Here each batch hashes its
+passwords in a process pool, then bulk_creates users, profiles, carts and
+search documents in one transaction, so signals never fire per row.
+ensure_user_rows() backfills any Profile/Cart rows that are missing.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+
+import django
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models.functions import Lower
+
+from cart.models import Cart
+from profiles.models import Profile
+from search.indexing import index_objects
+
+User = get_user_model()
+
+FIELDS = ("username", "email", "password", "first_name", "last_name")
+
+
+def init_worker():
+    # spawned workers (non-fork platforms) start without Django configured
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+
+
+def hash_passwords(passwords, pool=None):
+    """make_password over `passwords`; None gives an unusable password."""
+    if pool is None:
+        return [make_password(password) for password in passwords]
+    return list(pool.map(make_password, passwords, chunksize=16))
+
+
+def clean_rows(rows):
+    """
+    Split input rows into valid user dicts and (index, reason) rejections,
+    dropping usernames/emails already taken or repeated in the input.
+    Emails are compared case-insensitively.
+    """
+    valid, rejected = [], []
+    seen_usernames, seen_emails = set(), set()
+
+    for index, row in enumerate(rows):
+        wrong = [field for field in FIELDS if row.get(field) is not None and not isinstance(row[field], str)]
+        if wrong:
+            rejected.append((index, f"{', '.join(wrong)} must be text"))
+            continue
+
+        user = {field: (row.get(field) or "").strip() for field in FIELDS}
+        user["password"] = row.get("password") or None
+        user["email"] = user["email"].lower()
+
+        if not user["username"] or not user["email"]:
+            rejected.append((index, "username and email are required"))
+        elif user["username"] in seen_usernames or user["email"] in seen_emails:
+            rejected.append((index, "duplicate in input"))
+        else:
+            seen_usernames.add(user["username"])
+            seen_emails.add(user["email"])
+            valid.append((index, user))
+
+    return valid, rejected
+
+
+def provision_users(rows, batch_size=500, workers=None):
+    """
+    Create users from dicts with username, email, password, first_name and
+    last_name. Returns {"created": n, "rejected": [(row index, reason)]}.
+
+    `workers` > 1 hashes passwords in that many processes; the web API
+    passes 1 so request workers never fork.
+    """
+    valid, rejected = clean_rows(rows)
+    created = 0
+
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=init_worker) if workers != 1 else None
+    with pool or nullcontext():
+        for start in range(0, len(valid), batch_size):
+            batch = valid[start:start + batch_size]
+            taken_usernames, taken_emails = existing(batch)
+            fresh = []
+            for index, user in batch:
+                if user["username"] in taken_usernames or user["email"] in taken_emails:
+                    rejected.append((index, "username or email already exists"))
+                else:
+                    fresh.append(user)
+
+            hashes = hash_passwords([user["password"] for user in fresh], pool)
+            for user, hashed in zip(fresh, hashes):
+                user["password"] = hashed
+
+            created += create_batch(fresh)
+
+    rejected.sort()
+    return {"created": created, "rejected": rejected}
+
+
+def existing(batch):
+    """(usernames, lower-cased emails) from `batch` that are already taken."""
+    usernames = [user["username"] for _, user in batch]
+    emails = [user["email"] for _, user in batch]
+    taken_usernames = set(User.objects.filter(username__in=usernames).values_list("username", flat=True))
+    taken_emails = set(
+        User.objects
+        .annotate(email_lower=Lower("email"))
+        .filter(email_lower__in=emails)
+        .values_list("email_lower", flat=True)
+    )
+    return taken_usernames, taken_emails
+
+
+@transaction.atomic
+def create_batch(users):
+    if not users:
+        return 0
+
+    created = User.objects.bulk_create([User(**user) for user in users])
+    if created[0].pk is None:
+        # backends without INSERT ... RETURNING (MySQL): look the ids up
+        ids = dict(
+            User.objects
+            .filter(username__in=[user.username for user in created])
+            .values_list("username", "id")
+        )
+        for user in created:
+            user.pk = ids[user.username]
+
+    Profile.objects.bulk_create([Profile(user_id=user.pk) for user in created])
+    Cart.objects.bulk_create([Cart(user_id=user.pk) for user in created])
+    index_objects("user", created)
+    return len(created)
+
+
+@transaction.atomic
+def ensure_user_rows():
+    """Create missing Profile and Cart rows; returns how many of each."""
+    no_profile = list(User.objects.filter(profile__isnull=True).values_list("id", flat=True))
+    no_cart = list(User.objects.filter(cart__isnull=True).values_list("id", flat=True))
+
+    Profile.objects.bulk_create([Profile(user_id=user_id) for user_id in no_profile], batch_size=1000)
+    Cart.objects.bulk_create([Cart(user_id=user_id) for user_id in no_cart], batch_size=1000)
+    return {"profiles": len(no_profile), "carts": len(no_cart)}
@@ -1,3 +1,50 @@
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from .views import BulkUserImportView
+
+User = get_user_model()
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class BulkUserImportTests(TestCase):
+    def setUp(self):
+        self.staff = User.objects.create_user(username="staff", email="staff@example.com", password="x", is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.staff)
+
+    def post(self, rows):
+        return self.client.post("/api/accounts/admin/users/bulk/", rows, format="json")
+
+    def test_non_text_values_are_rejected_per_row(self):
+        response = self.post([
+            {"username": 42, "email": "num@example.com"},
+            {"username": "ok", "email": "ok@example.com", "password": ["x"]},
+            {"username": "fine", "email": "fine@example.com"},
+        ])
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual([row["index"] for row in response.data["rejected"]], [0, 1])
+        self.assertTrue(User.objects.filter(username="fine").exists())
+
+    def test_emails_are_unique_regardless_of_case(self):
+        User.objects.create_user(username="mixed", email="Mixed@Example.com", password="x")
+
+        response = self.post([
+            {"username": "again", "email": "mixed@example.com"},
+            {"username": "first", "email": "new@example.com"},
+            {"username": "second", "email": "NEW@example.com"},
+        ])
+
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual([row["index"] for row in response.data["rejected"]], [0, 2])
+
+    def test_large_batches_are_refused(self):
+        rows = [{"username": f"u{i}", "email": f"u{i}@example.com"} for i in range(BulkUserImportView.max_users + 1)]
+
+        response = self.post(rows)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("import_users", response.data["error"])
+        self.assertFalse(User.objects.filter(username="u0").exists())
@@ -1,6 +1,6 @@
 from django.contrib.auth.views import LoginView
 from django.urls import path
-from .views import RegisterView, CookieTokenObtainPairView, CookieTokenRefreshView, LogoutView, CurrentUserView
+from .views import RegisterView, CookieTokenObtainPairView, CookieTokenRefreshView, LogoutView, CurrentUserView, BulkUserImportView
 
 urlpatterns = [
     path("register/", RegisterView.as_view()),
@@ -8,5 +8,6 @@ urlpatterns = [
     path("refresh/", CookieTokenRefreshView.as_view()),
     path("logout/", LogoutView.as_view()),
     path("me/", CurrentUserView.as_view()),
+    path("admin/users/bulk/", BulkUserImportView.as_view()),
 ]
 
@@ -8,6 +8,7 @@ from rest_framework.response import Response
 
 from .serializers import RegisterSerializer
 from .authentication import CookieJWTAuthentication
+from .provisioning import provision_users, ensure_user_rows
 
 
 class RegisterView(generics.CreateAPIView):
@@ -103,3 +104,35 @@ class CurrentUserView(APIView):
             "last_name": user.last_name,
         })
 
+
+class BulkUserImportView(APIView):
+    """
+    POST /api/accounts/admin/users/bulk/
+    [{"username": ..., "email": ..., "password": ..., "first_name": ..., "last_name": ...}]
+
+    Staff only. Each password hash takes a sizeable fraction of a second,
+    so a request takes at most `max_users` rows to stay well inside worker
+    timeouts; larger batches go through `manage.py import_users`, which
+    hashes in parallel processes.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+    max_users = 25
+
+    def post(self, request):
+        rows = request.data
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            return Response({"error": "Expected a list of users"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(rows) > self.max_users:
+            return Response(
+                {"error": f"At most {self.max_users} users per request; use manage.py import_users for more"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        result = provision_users(rows, workers=1)
+        repaired = ensure_user_rows()
+        return Response({
+            "created": result["created"],
+            "rejected": [{"index": index, "reason": reason} for index, reason in result["rejected"]],
+            "repaired": repaired,
+        }, status=status.HTTP_201_CREATED)
@@ -3,6 +3,14 @@ ASGI config for backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+The whole app is served from this entry point (Procfile, render.yaml:
+gunicorn with uvicorn workers). The kitchen board stream
+(/api/orders/kitchen/stream/) is a long-lived server-sent events response
+that only works under ASGI, and the streamed list/export responses use
+async iterators (backend.streaming) so they are not buffered. Run with
+REDIS_URL set when there is more than one process so events reach every
+subscriber.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
 """
@@ -0,0 +1,41 @@
+"""
+Conditional GET helpers (ETag / Last-Modified) for API views.
+
+Views compute a validator from cheap metadata (updated_at columns, counts,
+versions) and check it *before* serializing, so a repeat poll costs one
+small query and returns an empty 304.
+
+The ETag is the authoritative validator. Last-Modified is sent for
+clients that display it, but deletes and per-viewer flags (is_liked, ...)
+don't move any timestamp, so If-Modified-Since alone is not trusted.
+"""
+
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+
+def make_etag(*parts):
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def add_validators(response, etag, last_modified=None):
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+
+    # cacheable, but clients must revalidate every time
+    patch_cache_control(response, no_cache=True)
+    # auth is cookie based, so the representation varies per viewer
+    patch_vary_headers(response, ("Cookie",))
+    return response
+
+
+def not_modified_response(request, etag, last_modified=None):
+    """Return a 304 if the client's If-None-Match still matches, else None."""
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        return None
+    return add_validators(response, etag, last_modified)
@@ -0,0 +1,40 @@
+"""
+Field filters shared across list views.
+"""
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+TRUE = ("1", "true", "yes")
+FALSE = ("0", "false", "no")
+NULL = ("null", "none")
+
+
+def parse_boolean(name, value):
+    value = value.strip().lower()
+    if value in TRUE:
+        return True
+    if value in FALSE:
+        return False
+    raise ValidationError({"error": f"{name} must be true or false"})
+
+
+class BooleanFieldFilter(BaseFilterBackend):
+    """
+    ?approved=true&is_veg=false style filters.
+
+    Views set `filter_fields`, a dict of query param -> model lookup, e.g.
+    {"is_veg": "food__is_veg"}. Lookups on nullable fields also accept
+    `null`.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        for param, lookup in getattr(view, "filter_fields", {}).items():
+            value = request.query_params.get(param)
+            if value is None or value == "":
+                continue
+            if value.strip().lower() in NULL:
+                queryset = queryset.filter(**{f"{lookup}__isnull": True})
+            else:
+                queryset = queryset.filter(**{lookup: parse_boolean(param, value)})
+        return queryset
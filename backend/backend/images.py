@@ -0,0 +1,139 @@
+"""
+Downscaled image variants for uploaded pictures (post images, avatars).
+
+The original upload is stored as before; after the row is committed a
+background thread renders thumb/feed/full sizes as WebP and JPEG with
+Pillow and records their storage names in a JSON field on the row:
+
+    {"source": "<original name>",
+     "thumb": {"webp": "...", "jpeg": "..."}, "feed": {...}, "full": {...}}
+
+Rendering goes through the field's storage, so it works the same against
+Cloudinary and the local filesystem. Rows the worker missed (process
+restart, errors) are picked up by `manage.py generate_image_variants`.
+"""
+
+import logging
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+# label -> longest edge in pixels
+VARIANT_SIZES = {
+    "thumb": 160,
+    "feed": 720,
+    "full": 1600,
+}
+
+FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+_executor = ThreadPoolExecutor(
+    max_workers=settings.IMAGE_VARIANT_WORKERS,
+    thread_name_prefix="image-variants",
+)
+
+
+def needs_variants(instance, field_name, variants_field):
+    image = getattr(instance, field_name)
+    variants = getattr(instance, variants_field) or {}
+    return bool(image) and variants.get("source") != image.name
+
+
+def render_variants(fp):
+    """Return {label: {ext: bytes}} for one source image."""
+    with Image.open(fp) as source:
+        # bake the EXIF rotation in; nothing else from EXIF is carried over
+        image = ImageOps.exif_transpose(source)
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+
+        rendered = {}
+        for label, edge in VARIANT_SIZES.items():
+            resized = image.copy()
+            resized.thumbnail((edge, edge), Image.LANCZOS)
+
+            rendered[label] = {}
+            for ext, (pil_format, options) in FORMATS.items():
+                buffer = BytesIO()
+                resized.save(buffer, pil_format, **options)
+                rendered[label][ext] = buffer.getvalue()
+
+    return rendered
+
+
+def generate_variants(model, pk, field_name, variants_field, on_done=None):
+    instance = model._default_manager.filter(pk=pk).first()
+    if instance is None or not needs_variants(instance, field_name, variants_field):
+        return None
+
+    image = getattr(instance, field_name)
+    storage = image.storage
+    directory, filename = posixpath.split(image.name)
+    stem = posixpath.splitext(filename)[0]
+
+    with image.open("rb") as fp:
+        rendered = render_variants(fp)
+
+    variants = {"source": image.name}
+    for label, files in rendered.items():
+        variants[label] = {}
+        for ext, data in files.items():
+            name = posixpath.join(directory, "variants", f"{stem}-{label}.{ext}")
+            variants[label][ext] = storage.save(name, ContentFile(data))
+
+    updates = {variants_field: variants}
+    if any(field.name == "updated_at" for field in model._meta.concrete_fields):
+        updates["updated_at"] = timezone.now()
+
+    # only write if the image wasn't replaced while we were rendering
+    model._default_manager.filter(pk=pk, **{field_name: image.name}).update(**updates)
+
+    if on_done is not None:
+        on_done()
+    return variants
+
+
+def _run(*args):
+    close_old_connections()
+    try:
+        generate_variants(*args)
+    except Exception:
+        logger.exception("Image variant generation failed for %s", args[:2])
+    finally:
+        close_old_connections()
+
+
+def schedule_variants(instance, field_name, variants_field, on_done=None):
+    """Render variants for `instance` once the current transaction commits."""
+    if not needs_variants(instance, field_name, variants_field):
+        return
+
+    args = (type(instance), instance.pk, field_name, variants_field, on_done)
+
+    if settings.IMAGE_VARIANTS_ASYNC:
+        transaction.on_commit(lambda: _executor.submit(_run, *args))
+    else:
+        transaction.on_commit(lambda: _run(*args))
+
+
+def variant_urls(image, variants):
+    """Storage names from a variants dict -> {label: {ext: url}}."""
+    if not image or not variants or variants.get("source") != image.name:
+        return None
+
+    return {
+        label: {ext: image.storage.url(name) for ext, name in variants[label].items()}
+        for label in VARIANT_SIZES
+        if label in variants
+    }
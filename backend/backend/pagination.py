@@ -0,0 +1,316 @@
+"""
+Pagination classes shared across apps.
+"""
+
+import base64
+import json
+
+from django.db import connections
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param, remove_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination keyed on (ordering_field, id), highest first unless
+    `descending` is False.
+
+    Every page is a `WHERE (field, id) < (cursor)` range read off the
+    composite index, so fetching page 500 costs the same as page 1.
+    The cursor is opaque to clients (urlsafe base64 of the boundary row).
+    """
+
+    ordering_field = "created_at"
+    descending = True
+    page_size = 20
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    invalid_cursor_message = "Invalid cursor"
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    # cursor encoding -----------------------------------------------------
+
+    def encode_position(self, value):
+        return value.isoformat()
+
+    def decode_position(self, raw):
+        position = parse_datetime(raw)
+        if position is None:
+            raise ValueError(raw)
+        return position
+
+    def encode_cursor(self, row, reverse):
+        payload = {
+            "t": self.encode_position(getattr(row, self.ordering_field)),
+            "id": row.pk,
+        }
+        if reverse:
+            payload["r"] = 1
+
+        raw = json.dumps(payload, separators=(",", ":")).encode()
+        token = base64.urlsafe_b64encode(raw).decode().rstrip("=")
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            payload = json.loads(raw)
+            position = self.decode_position(payload["t"])
+            pk = int(payload["id"])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return position, pk, bool(payload.get("r"))
+
+    # pagination ------------------------------------------------------------
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = remove_query_param(
+            request.build_absolute_uri(), self.cursor_query_param
+        )
+        self.limit = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+        reverse = cursor is not None and cursor[2]
+
+        rows = self.fetch(queryset, cursor)
+        has_more = len(rows) > self.limit
+        rows = rows[: self.limit]
+
+        if reverse:
+            rows.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+
+        self.page = rows
+        return rows
+
+    def fetch(self, queryset, cursor):
+        """Up to limit + 1 rows past `cursor`, in walking order."""
+        return list(self.window(queryset, cursor)[: self.limit + 1])
+
+    def window(self, queryset, cursor):
+        field = self.ordering_field
+        # a "previous" cursor walks against the page order
+        down = self.descending == (cursor is None or not cursor[2])
+        order = (f"-{field}", "-id") if down else (field, "id")
+
+        if cursor is None:
+            return queryset.order_by(*order)
+
+        position, pk, _ = cursor
+        op = "lt" if down else "gt"
+        return queryset.filter(
+            Q(**{f"{field}__{op}": position})
+            | Q(**{field: position, f"id__{op}": pk})
+        ).order_by(*order)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class IdKeysetPagination(KeysetPagination):
+    """Keyset pages in ascending id order, for catalog-style lists."""
+
+    ordering_field = "id"
+    descending = False
+
+    def encode_position(self, value):
+        return value
+
+    def decode_position(self, raw):
+        return int(raw)
+
+
+def estimate_count(queryset):
+    """
+    Row count from the query planner instead of COUNT(*), where the
+    database offers one (PostgreSQL, MySQL); None elsewhere.
+    """
+    queryset = queryset.order_by().values("pk")
+    connection = connections[queryset.db]
+    sql, params = queryset.query.sql_with_params()
+
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]["Plan"]["Plan Rows"])
+
+        if connection.vendor == "mysql":
+            cursor.execute(f"EXPLAIN {sql}", params)
+            columns = [column[0] for column in cursor.description]
+            row = dict(zip(columns, cursor.fetchone()))
+            return int((row.get("rows") or 0) * float(row.get("filtered") or 100) / 100)
+
+    return None
+
+
+class CatalogPagination(BasePagination):
+    """
+    Project default pagination (REST_FRAMEWORK["DEFAULT_PAGINATION_CLASS"]).
+
+    ?limit=&offset= pages in the queryset's own order (e.g. search rank),
+    with id as the tiebreaker, or in id order when it has none, and
+    responds with {count, next, previous, results}. ?count=estimate takes
+    the count from the query planner (exact below `exact_count_below`
+    rows, and on databases without an estimate); ?count=none skips it.
+    Passing ?cursor= (empty for the first page) switches to keyset pages
+    in id order, {next, previous, results}, whose cost does not grow with
+    depth; it is refused for querysets ordered some other way. Either way
+    a page holds at most `max_limit` rows.
+    """
+
+    default_limit = None  # PAGE_SIZE
+    max_limit = 200
+    limit_query_param = "limit"
+    offset_query_param = "offset"
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+    exact_count_below = 1000
+
+    def get_limit(self, request):
+        default = self.default_limit or api_settings.PAGE_SIZE
+        try:
+            limit = int(request.query_params[self.limit_query_param])
+        except (KeyError, ValueError):
+            return default
+        return min(limit, self.max_limit) if limit > 0 else default
+
+    def get_offset(self, request):
+        try:
+            return max(int(request.query_params[self.offset_query_param]), 0)
+        except (KeyError, ValueError):
+            return 0
+
+    @staticmethod
+    def ordering(queryset):
+        """The queryset's ordering terms, () when it is unordered."""
+        if queryset.query.order_by:
+            return tuple(queryset.query.order_by)
+        if queryset.query.default_ordering and queryset.model._meta.ordering:
+            return tuple(queryset.model._meta.ordering)
+        return ()
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_limit(request)
+        ordering = self.ordering(queryset)
+
+        if self.cursor_query_param in request.query_params:
+            if ordering not in ((), ("id",), ("pk",)):
+                raise ValidationError({"error": "cursor paging is not available here; use limit and offset"})
+            self.keyset = IdKeysetPagination()
+            self.keyset.page_size = self.limit
+            self.keyset.max_page_size = self.max_limit
+            self.keyset.page_size_query_param = self.limit_query_param
+            return self.keyset.paginate_queryset(queryset, request, view)
+
+        self.keyset = None
+        self.offset = self.get_offset(request)
+        self.count = self.get_count(queryset, request)
+
+        if not ordering:
+            ordering = ("id",)
+        elif not {"id", "pk", "-id", "-pk"} & set(ordering):
+            ordering += ("id",)
+        rows = list(queryset.order_by(*ordering)[self.offset:self.offset + self.limit + 1])
+        self.has_next = len(rows) > self.limit
+        return rows[:self.limit]
+
+    def get_count(self, queryset, request):
+        mode = request.query_params.get(self.count_query_param, "exact")
+        if mode == "none":
+            return None
+        if mode == "estimate":
+            estimate = estimate_count(queryset)
+            if estimate is not None and estimate >= self.exact_count_below:
+                return estimate
+        return queryset.count()
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(url, self.offset_query_param, self.offset + self.limit)
+
+    def get_previous_link(self):
+        if self.offset <= 0:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        previous = max(self.offset - self.limit, 0)
+        if previous == 0:
+            return remove_query_param(url, self.offset_query_param)
+        return replace_query_param(url, self.offset_query_param, previous)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return Response({
+            "count": self.count,
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "count": {"type": "integer", "nullable": True},
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
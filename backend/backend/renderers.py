@@ -0,0 +1,14 @@
+from rest_framework.renderers import JSONRenderer
+
+
+class PrerenderedJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that passes `bytes` data through unchanged, so a view can
+    answer with JSON rendered ahead of time (menu.catalog) and still go
+    through content negotiation and the browsable API.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, bytes):
+            return data
+        return super().render(data, accepted_media_type, renderer_context)
@@ -7,6 +7,7 @@ from pathlib import Path
 from datetime import timedelta
 
 import dj_database_url
+from corsheaders.defaults import default_headers
 
 # ------------------------------------------------------------------------------
 # BASE
@@ -69,6 +70,8 @@ INSTALLED_APPS = [
     "cart",
     "orders",
     "post",
+    "search",
+    "idempotency",
 ]
 
 AUTH_USER_MODEL = "accounts.User"
@@ -145,6 +148,29 @@ else:
         }
     }
 # ------------------------------------------------------------------------------
+# CACHE
+# ------------------------------------------------------------------------------
+
+REDIS_URL = os.environ.get("REDIS_URL")
+
+if REDIS_URL:
+    # Shared across gunicorn workers / instances
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    # Per-process; fine for local development
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "fomo",
+        }
+    }
+
+# ------------------------------------------------------------------------------
 # PASSWORD VALIDATION
 # ------------------------------------------------------------------------------
 
@@ -180,7 +206,19 @@ STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 # CLOUDINARY
 # ------------------------------------------------------------------------------
 
-DEFAULT_FILE_STORAGE = "cloudinary_storage.storage.MediaCloudinaryStorage"
+# Override with django.core.files.storage.FileSystemStorage to work offline
+DEFAULT_FILE_STORAGE = os.environ.get(
+    "DEFAULT_FILE_STORAGE",
+    "cloudinary_storage.storage.MediaCloudinaryStorage"
+)
+
+# ------------------------------------------------------------------------------
+# IMAGE VARIANTS
+# ------------------------------------------------------------------------------
+
+# Render thumb/feed/full variants in a background thread after upload
+IMAGE_VARIANTS_ASYNC = os.environ.get("IMAGE_VARIANTS_ASYNC", "True").lower() == "true"
+IMAGE_VARIANT_WORKERS = int(os.environ.get("IMAGE_VARIANT_WORKERS", "2"))
 
 # ------------------------------------------------------------------------------
 # DJANGO REST FRAMEWORK & JWT
@@ -190,7 +228,14 @@ DEFAULT_FILE_STORAGE = "cloudinary_storage.storage.MediaCloudinaryStorage"
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "accounts.authentication.CookieJWTAuthentication",
-    )
+    ),
+    # Every generic list is paged: ?limit=&offset= (or ?cursor=), at most
+    # CatalogPagination.max_limit rows; ?count=estimate skips COUNT(*)
+    "DEFAULT_PAGINATION_CLASS": "backend.pagination.CatalogPagination",
+    "PAGE_SIZE": int(os.environ.get("API_PAGE_SIZE", "50")),
+    "DEFAULT_FILTER_BACKENDS": (
+        "backend.filters.BooleanFieldFilter",
+    ),
 }
 
 SIMPLE_JWT = {
@@ -204,6 +249,46 @@ SIMPLE_JWT = {
 JWT_AUTH_COOKIE = "access_token"
 JWT_REFRESH_COOKIE = "refresh_token"
 
+# ------------------------------------------------------------------------------
+# POST FEED
+# ------------------------------------------------------------------------------
+
+POST_FEED_PAGE_SIZE = int(os.environ.get("POST_FEED_PAGE_SIZE", "20"))
+POST_FEED_MAX_PAGE_SIZE = 100
+POST_FEED_CACHE_TIMEOUT = int(os.environ.get("POST_FEED_CACHE_TIMEOUT", "300"))
+
+# Trending: a like's weight halves every TRENDING_HALF_LIFE_HOURS.
+# Changing it requires `manage.py recompute_trending`.
+TRENDING_HALF_LIFE_HOURS = float(os.environ.get("TRENDING_HALF_LIFE_HOURS", "24"))
+
+# ------------------------------------------------------------------------------
+# IDEMPOTENCY KEYS
+# ------------------------------------------------------------------------------
+
+# Stored responses are replayed for this long, then purged by
+# `manage.py purge_idempotency_keys`
+IDEMPOTENCY_KEY_TTL_HOURS = int(os.environ.get("IDEMPOTENCY_KEY_TTL_HOURS", "24"))
+
+# ------------------------------------------------------------------------------
+# CART
+# ------------------------------------------------------------------------------
+
+# "db" reads and writes cart_cartitem directly; "cache" keeps each active
+# cart as one cached document written behind to the database (see
+# cart/store.py). Use "cache" only with a shared cache (REDIS_URL), and run
+# `manage.py flush_carts` periodically so idle carts reach the database.
+CART_STORE = os.environ.get("CART_STORE", "db")
+CART_CACHE_TIMEOUT = int(os.environ.get("CART_CACHE_TIMEOUT", str(7 * 24 * 3600)))
+CART_WRITE_BEHIND_SECONDS = int(os.environ.get("CART_WRITE_BEHIND_SECONDS", "60"))
+
+# ------------------------------------------------------------------------------
+# ORDERS
+# ------------------------------------------------------------------------------
+
+# Delivered/cancelled orders older than this move to the archive tables
+# when `manage.py archive_orders` runs
+ORDER_ARCHIVE_AFTER_DAYS = int(os.environ.get("ORDER_ARCHIVE_AFTER_DAYS", "90"))
+
 # ------------------------------------------------------------------------------
 # CORS
 # ------------------------------------------------------------------------------
@@ -218,6 +303,9 @@ CORS_ALLOWED_ORIGINS = [
 
 CORS_ALLOW_CREDENTIALS = True
 
+CORS_ALLOW_HEADERS = (*default_headers, "idempotency-key")
+CORS_EXPOSE_HEADERS = ["ETag", "Idempotent-Replayed"]
+
 # ------------------------------------------------------------------------------
 # INTERNAL IPS
 # ------------------------------------------------------------------------------
@@ -0,0 +1,159 @@
+"""
+Streaming JSON arrays, CSV and NDJSON for large list responses.
+
+The queryset is read with `iterator(chunk_size=...)` (prefetches run per
+chunk) and each chunk is serialized and written out before the next one
+is fetched, so a worker only ever holds one chunk in memory regardless of
+how many rows the response contains.
+
+The app is served over ASGI, where Django buffers a synchronous
+streaming body in full before sending it. Responses are therefore built
+on async iterators (`aiterate`) that advance the synchronous,
+database-reading generator one chunk at a time in the sync thread.
+"""
+
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.http import StreamingHttpResponse
+from rest_framework import serializers
+from rest_framework.utils.encoders import JSONEncoder
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+_DONE = object()
+
+
+def aiterate(iterable):
+    """
+    Async iterator over a synchronous iterable, advancing it in the sync
+    thread (thread_sensitive, so the same DB connection and server-side
+    cursor) with one sync_to_async hop per item; yield chunks, not rows.
+    """
+    iterator = iter(iterable)
+    step = sync_to_async(next, thread_sensitive=True)
+
+    async def generate():
+        try:
+            while (item := await step(iterator, _DONE)) is not _DONE:
+                yield item
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                await sync_to_async(close, thread_sensitive=True)()
+
+    return generate()
+
+
+def wants_stream(request):
+    return request.query_params.get("stream", "").lower() in ("1", "true")
+
+
+def iter_chunks(queryset, chunk_size=DEFAULT_CHUNK_SIZE):
+    chunk = []
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        chunk.append(obj)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def stream_json_array(queryset, serializer_class, context=None,
+                      context_for_chunk=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    StreamingHttpResponse writing `queryset` as a JSON array.
+
+    `context_for_chunk(objs)` builds the serializer context per chunk, for
+    serializers that batch-load per-request state (e.g. post ViewerState).
+    """
+
+    def generate():
+        yield "["
+        separator = ""
+        for chunk in iter_chunks(queryset, chunk_size):
+            chunk_context = context_for_chunk(chunk) if context_for_chunk else (context or {})
+            data = serializer_class(chunk, many=True, context=chunk_context).data
+            if data:
+                yield separator + ",".join(json.dumps(item, cls=JSONEncoder) for item in data)
+                separator = ","
+        yield "]"
+
+    return StreamingHttpResponse(aiterate(generate()), content_type="application/json")
+
+
+def batched(rows, size):
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+def attachment(response, filename):
+    if filename:
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+_datetime_field = serializers.DateTimeField()
+
+
+def export_value(value):
+    """
+    A raw column value as the API would send it: datetimes in local time
+    (DateTimeField's format), dates ISO-8601, Decimals as exact strings.
+    """
+    if isinstance(value, datetime):
+        return _datetime_field.to_representation(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def csv_row(row):
+    return [export_value(value) for value in row]
+
+
+def stream_csv(columns, rows, filename=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    StreamingHttpResponse writing `rows` (tuples, e.g. from
+    values_list(...).iterator()) as CSV under a `columns` header line.
+    Each chunk of rows is rendered and sent as one piece.
+    """
+
+    def generate():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        yield buffer.getvalue()
+
+        for batch in batched(rows, chunk_size):
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(map(csv_row, batch))
+            yield buffer.getvalue()
+
+    response = StreamingHttpResponse(aiterate(generate()), content_type="text/csv")
+    return attachment(response, filename)
+
+
+def stream_ndjson(columns, rows, filename=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Like stream_csv, but one JSON object per line keyed by `columns`."""
+
+    def generate():
+        for batch in batched(rows, chunk_size):
+            yield "".join(
+                json.dumps(dict(zip(columns, map(export_value, row)))) + "\n"
+                for row in batch
+            )
+
+    response = StreamingHttpResponse(aiterate(generate()), content_type="application/x-ndjson")
+    return attachment(response, filename)
@@ -27,6 +27,7 @@ urlpatterns = [
     path('api/orders/',include('orders.urls')),
     path('api/profile/',include('profiles.urls')),
     path('api/posts/',include('post.urls')),
+    path('api/search/',include('search.urls')),
 ]
 
 if settings.DEBUG:
@@ -0,0 +1,43 @@
+"""
+Version numbers for cache entries that are invalidated all at once.
+
+Entries are stored under keys that embed the current version; bumping the
+version makes every one of them unreachable without deleting anything,
+and the old entries age out on their own timeout.
+"""
+
+from django.core.cache import cache
+
+
+class VersionedKey:
+    """
+    The version counter stored at "<name>:version", and keys under it.
+
+        CATALOG = VersionedKey("menu:catalog")
+        CATALOG.key()   # "menu:catalog:v3"
+        CATALOG.bump()  # every "menu:catalog:v3..." key is now stale
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.version_key = f"{name}:version"
+
+    def current(self):
+        version = cache.get(self.version_key)
+        if version is None:
+            cache.add(self.version_key, 1, None)
+            version = cache.get(self.version_key, 1)
+        return version
+
+    def bump(self):
+        try:
+            cache.incr(self.version_key)
+        except ValueError:
+            # key missing or evicted
+            cache.add(self.version_key, 1, None)
+            cache.incr(self.version_key)
+
+    def key(self, *parts, version=None):
+        if version is None:
+            version = self.current()
+        return ":".join([f"{self.name}:v{version}", *map(str, parts)])
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from cart.store import get_store
+
+
+class Command(BaseCommand):
+    help = (
+        "Write carts held in the cache store to the database once they have been "
+        "unsaved for CART_WRITE_BEHIND_SECONDS. Run it every minute or so when "
+        "CART_STORE is \"cache\"; with the database store it does nothing."
+    )
+
+    def handle(self, *args, **options):
+        flushed = get_store().flush_pending()
+        self.stdout.write(self.style.SUCCESS(f"Flushed {flushed} cart(s)."))
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-18 13:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cart', '0003_alter_cart_user'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cart',
+            name='pending_since',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
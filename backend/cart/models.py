@@ -10,6 +10,8 @@ class Cart(models.Model):
         related_name='cart'
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    # set while the cache cart store holds changes not yet in cart_cartitem
+    pending_since = models.DateTimeField(null=True, blank=True, db_index=True)
 
 
     def __str__(self):
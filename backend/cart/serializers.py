@@ -1,24 +1,44 @@
 from rest_framework import serializers
-from .models import Cart, CartItem
+from menu.prices import price_lines
 
-class CartItemSerializer(serializers.ModelSerializer):
 
-    food_name = serializers.CharField(
-        source = "menu_item.food.name",
-        read_only = True,
-    )
-    price = serializers.DecimalField(
-        source = "menu_item.price",
-        read_only=True,
-        max_digits=10, decimal_places=2 )
+class CartItemSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    menu_item = serializers.IntegerField()
+    food_name = serializers.CharField(allow_null=True)
+    price = serializers.DecimalField(max_digits=10, decimal_places=2, allow_null=True)
+    quantity = serializers.IntegerField()
+    subtotal = serializers.DecimalField(max_digits=12, decimal_places=2, allow_null=True)
+    available = serializers.BooleanField()
 
-    class Meta:
-        model = CartItem
-        fields = ('id','menu_item','food_name','price','quantity')
 
+class CartSerializer(serializers.Serializer):
+    """Serializes cart_data(snapshot) from either cart store."""
 
-class CartSerializer(serializers.ModelSerializer):
-    items = CartItemSerializer(many=True, read_only=True)
-    class Meta:
-        model = Cart
-        fields = ('id','items')
+    id = serializers.IntegerField()
+    items = CartItemSerializer(many=True)
+    total = serializers.DecimalField(max_digits=12, decimal_places=2)
+    has_unavailable = serializers.BooleanField()
+
+
+def cart_data(snapshot):
+    """A CartSnapshot priced server-side, with unavailable lines flagged."""
+    priced, total = price_lines((line.menu_item_id, line.quantity) for line in snapshot.lines)
+    items = [
+        {
+            "id": line.id,
+            "menu_item": menu_item_id,
+            "food_name": entry.food_name if entry else None,
+            "price": entry.price if entry else None,
+            "quantity": quantity,
+            "subtotal": subtotal,
+            "available": subtotal is not None,
+        }
+        for line, (menu_item_id, quantity, entry, subtotal) in zip(snapshot.lines, priced)
+    ]
+    return {
+        "id": snapshot.id,
+        "items": items,
+        "total": total,
+        "has_unavailable": any(not item["available"] for item in items),
+    }
@@ -0,0 +1,338 @@
+"""
+Where the active cart lives.
+
+DatabaseCartStore (the default) reads and writes cart_cartitem directly.
+CacheCartStore (CART_STORE = "cache") keeps each user's cart as one small
+cached document, {"cart": id, "items": [[menu_item_id, quantity], ...]},
+so reads and mutations are a cache round trip instead of several queries.
+Changes are written behind to cart_cartitem when the document has not been
+persisted for CART_WRITE_BEHIND_SECONDS, always before checkout (which
+reads the database), and by `manage.py flush_carts`, which writes every
+cart left unsaved for longer than that window. The first unsaved change
+stamps Cart.pending_since so that command can find the cart without
+scanning the cache. A cache entry lost before it was flushed is reloaded
+from cart_cartitem, losing those changes.
+
+Every change to a document happens under a per-user cache lock; a
+request that cannot get the lock fails with CartBusy (409) rather than
+risk overwriting a concurrent change. Checkout holds the same lock from
+the flush until the document is dropped, so an add cannot land in
+between and vanish with it.
+
+Both stores hand views a CartSnapshot whose lines carry an id usable with
+/api/cart/item/<id>/: the CartItem pk for the database store, the menu
+item id for the cache store.
+"""
+
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from .models import Cart, CartItem
+
+CartLine = namedtuple("CartLine", "id menu_item_id quantity")
+CartSnapshot = namedtuple("CartSnapshot", "id lines")
+
+OPS = ("add", "set", "remove")
+
+
+class CartBusy(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = {"error": "The cart is being updated by another request, try again"}
+    default_code = "cart_busy"
+
+
+def fold_ops(ops):
+    """
+    Collapse (op, menu_item_id, quantity) operations, applied in order,
+    into one final action per menu item: ("add", n), ("set", n) or
+    ("remove", None).
+    """
+    actions = {}
+    for op, menu_item_id, quantity in ops:
+        current = actions.get(menu_item_id)
+        if op == "add" and current is not None:
+            kind, amount = current
+            actions[menu_item_id] = ("set", quantity) if kind == "remove" else (kind, amount + quantity)
+        else:
+            actions[menu_item_id] = (op, quantity)
+    return actions
+
+
+class DatabaseCartStore:
+    def snapshot(self, user):
+        cart, _ = Cart.objects.get_or_create(user=user)
+        lines = [
+            CartLine(*row)
+            for row in CartItem.objects
+            .filter(cart=cart)
+            .order_by("id")
+            .values_list("id", "menu_item_id", "quantity")
+        ]
+        return CartSnapshot(cart.id, lines)
+
+    def add(self, user, menu_item_id, quantity):
+        self.apply(user, [("add", menu_item_id, quantity)])
+
+    @transaction.atomic
+    def apply(self, user, ops):
+        """
+        Apply a batch of operations with at most three writes: one
+        increment upsert for adds, one overwrite upsert for sets and one
+        DELETE for removals. Increments happen in the database, so
+        concurrent adds of the same item both count.
+        """
+        cart, _ = Cart.objects.get_or_create(user=user)
+        actions = fold_ops(ops)
+
+        by_kind = {kind: [] for kind in OPS}
+        for menu_item_id, (kind, quantity) in actions.items():
+            by_kind[kind].append((menu_item_id, quantity))
+
+        if by_kind["add"]:
+            with connection.cursor() as cursor:
+                cursor.execute(*increment_sql(cart.id, by_kind["add"]))
+        if by_kind["set"]:
+            CartItem.objects.bulk_create(
+                [
+                    CartItem(cart=cart, menu_item_id=menu_item_id, quantity=quantity)
+                    for menu_item_id, quantity in by_kind["set"]
+                ],
+                **upsert_options(),
+            )
+        if by_kind["remove"]:
+            CartItem.objects.filter(
+                cart=cart,
+                menu_item_id__in=[menu_item_id for menu_item_id, _ in by_kind["remove"]],
+            ).delete()
+
+    def set_quantity(self, user, line_id, quantity):
+        return CartItem.objects.filter(pk=line_id, cart__user=user).update(quantity=quantity) > 0
+
+    def remove(self, user, line_id):
+        deleted, _ = CartItem.objects.filter(pk=line_id, cart__user=user).delete()
+        return deleted > 0
+
+    def flush(self, user):
+        pass
+
+    @contextmanager
+    def checking_out(self, user):
+        # cart_cartitem is the cart; checkout's own transaction covers it
+        yield
+
+    def flush_pending(self):
+        return 0
+
+
+class CacheCartStore:
+    lock_timeout = 5
+    lock_attempts = 50
+
+    def __init__(self):
+        self.timeout = settings.CART_CACHE_TIMEOUT
+        self.write_behind = settings.CART_WRITE_BEHIND_SECONDS
+
+    @staticmethod
+    def key(user):
+        return f"cart:doc:{user.pk}"
+
+    # document -------------------------------------------------------------
+
+    def load(self, user):
+        doc = cache.get(self.key(user))
+        if doc is None:
+            cart, _ = Cart.objects.get_or_create(user=user)
+            items = CartItem.objects.filter(cart=cart).order_by("id").values_list("menu_item_id", "quantity")
+            doc = {"cart": cart.id, "items": [list(row) for row in items], "flushed": time.time(), "dirty": False}
+            cache.set(self.key(user), doc, self.timeout)
+        return doc
+
+    def save(self, user, doc):
+        if time.time() - doc["flushed"] >= self.write_behind:
+            self.persist(doc)
+        elif not doc["dirty"]:
+            # first unsaved change: leave a marker for flush_carts
+            Cart.objects.filter(pk=doc["cart"]).update(pending_since=timezone.now())
+            doc["dirty"] = True
+        cache.set(self.key(user), doc, self.timeout)
+
+    def persist(self, doc):
+        """Make cart_cartitem match the document."""
+        with transaction.atomic():
+            Cart.objects.filter(pk=doc["cart"]).update(pending_since=None)
+            CartItem.objects.filter(cart_id=doc["cart"]).exclude(
+                menu_item_id__in=[menu_item_id for menu_item_id, _ in doc["items"]]
+            ).delete()
+            if doc["items"]:
+                CartItem.objects.bulk_create(
+                    [
+                        CartItem(cart_id=doc["cart"], menu_item_id=menu_item_id, quantity=quantity)
+                        for menu_item_id, quantity in doc["items"]
+                    ],
+                    **upsert_options(),
+                )
+        doc["flushed"] = time.time()
+        doc["dirty"] = False
+
+    @contextmanager
+    def locked(self, user):
+        """Hold the user's document lock; raises CartBusy if it stays taken."""
+        lock = f"{self.key(user)}:lock"
+        for _ in range(self.lock_attempts):
+            if cache.add(lock, 1, self.lock_timeout):
+                break
+            time.sleep(0.01)
+        else:
+            raise CartBusy
+        try:
+            yield
+        finally:
+            cache.delete(lock)
+
+    def mutate(self, user, change):
+        """Apply `change(items)` to the document under the user's lock."""
+        with self.locked(user):
+            doc = self.load(user)
+            result = change(doc["items"])
+            self.save(user, doc)
+            return result
+
+    # store interface --------------------------------------------------------
+
+    def snapshot(self, user):
+        doc = self.load(user)
+        lines = [CartLine(menu_item_id, menu_item_id, quantity) for menu_item_id, quantity in doc["items"]]
+        return CartSnapshot(doc["cart"], lines)
+
+    def add(self, user, menu_item_id, quantity):
+        self.apply(user, [("add", menu_item_id, quantity)])
+
+    def apply(self, user, ops):
+        actions = fold_ops(ops)
+
+        def change(items):
+            kept = []
+            for menu_item_id, quantity in items:
+                kind, amount = actions.pop(menu_item_id, (None, None))
+                if kind == "add":
+                    kept.append([menu_item_id, quantity + amount])
+                elif kind == "set":
+                    kept.append([menu_item_id, amount])
+                elif kind is None:
+                    kept.append([menu_item_id, quantity])
+            # whatever is left is new to the cart
+            kept += [
+                [menu_item_id, amount]
+                for menu_item_id, (kind, amount) in actions.items()
+                if kind != "remove"
+            ]
+            items[:] = kept
+
+        self.mutate(user, change)
+
+    def set_quantity(self, user, line_id, quantity):
+        def change(items):
+            for line in items:
+                if line[0] == line_id:
+                    line[1] = quantity
+                    return True
+            return False
+
+        return self.mutate(user, change)
+
+    def remove(self, user, line_id):
+        def change(items):
+            kept = [line for line in items if line[0] != line_id]
+            found = len(kept) != len(items)
+            items[:] = kept
+            return found
+
+        return self.mutate(user, change)
+
+    def flush(self, user):
+        with self.locked(user):
+            self.flush_locked(user)
+
+    def flush_locked(self, user):
+        doc = cache.get(self.key(user))
+        if doc is not None and doc["dirty"]:
+            self.persist(doc)
+            cache.set(self.key(user), doc, self.timeout)
+        else:
+            # nothing unsaved, or the document was evicted
+            Cart.objects.filter(user=user, pending_since__isnull=False).update(pending_since=None)
+
+    @contextmanager
+    def checking_out(self, user):
+        """
+        Persist the cart and hold the user's lock while the order is
+        placed; the document is dropped only if the block succeeds.
+        """
+        with self.locked(user):
+            self.flush_locked(user)
+            yield
+            # checkout emptied cart_cartitem; start the document over from it
+            cache.delete(self.key(user))
+
+    def flush_pending(self):
+        """Persist every cart unsaved for longer than the write-behind window."""
+        cutoff = timezone.now() - timedelta(seconds=self.write_behind)
+        carts = Cart.objects.filter(pending_since__lte=cutoff).select_related("user")
+        flushed = 0
+        for cart in carts.iterator():
+            try:
+                self.flush(cart.user)
+            except CartBusy:
+                # being edited right now; the next run gets it
+                continue
+            flushed += 1
+        return flushed
+
+
+def increment_sql(cart_id, lines):
+    """INSERT of (menu_item_id, quantity) lines that adds to existing quantities."""
+    table = connection.ops.quote_name(CartItem._meta.db_table)
+    placeholders = ", ".join(["(%s, %s, %s)"] * len(lines))
+    params = []
+    for menu_item_id, quantity in lines:
+        params += [cart_id, menu_item_id, quantity]
+
+    if connection.vendor == "mysql":
+        conflict = "ON DUPLICATE KEY UPDATE quantity = quantity + VALUES(quantity)"
+    else:
+        # postgresql and sqlite
+        conflict = (
+            f"ON CONFLICT (cart_id, menu_item_id) "
+            f"DO UPDATE SET quantity = {table}.quantity + excluded.quantity"
+        )
+
+    sql = f"INSERT INTO {table} (cart_id, menu_item_id, quantity) VALUES {placeholders} {conflict}"
+    return sql, params
+
+
+def upsert_options():
+    """bulk_create kwargs that update quantity on a (cart, menu_item) clash."""
+    options = {"update_conflicts": True, "update_fields": ["quantity"]}
+    if connection.features.supports_update_conflicts_with_target:
+        options["unique_fields"] = ["cart", "menu_item"]
+    return options
+
+
+STORES = {"db": DatabaseCartStore, "cache": CacheCartStore}
+_store = None
+
+
+def get_store():
+    global _store
+    if _store is None:
+        _store = STORES[settings.CART_STORE]()
+    return _store
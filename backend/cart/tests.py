@@ -1,3 +1,72 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from menu.models import Food, MenuItems
+from .models import Cart, CartItem
+from .store import CacheCartStore, CartBusy
+
+User = get_user_model()
+
+
+@override_settings(CART_WRITE_BEHIND_SECONDS=60)
+class CacheCartStoreTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.store = CacheCartStore()
+        self.user = User.objects.create_user(username="cart", email="cart@example.com", password="x")
+        food = Food.objects.create(name="momo", approved=True)
+        self.item = MenuItems.objects.create(food=food, price=100, available=True)
+
+    def saved_lines(self):
+        return list(CartItem.objects.filter(cart__user=self.user).values_list("menu_item_id", "quantity"))
+
+    def test_idle_cart_is_flushed_by_flush_pending(self):
+        self.store.add(self.user, self.item.id, 2)
+
+        # inside the window: cached only, but marked for flushing
+        self.assertEqual(self.saved_lines(), [])
+        self.assertIsNotNone(Cart.objects.get(user=self.user).pending_since)
+        self.assertEqual(self.store.flush_pending(), 0)
+
+        Cart.objects.filter(user=self.user).update(pending_since=timezone.now() - timedelta(minutes=5))
+        self.assertEqual(self.store.flush_pending(), 1)
+
+        self.assertEqual(self.saved_lines(), [(self.item.id, 2)])
+        self.assertIsNone(Cart.objects.get(user=self.user).pending_since)
+
+    def test_changes_fail_when_the_lock_is_held(self):
+        cache.add(f"{self.store.key(self.user)}:lock", 1, 5)
+
+        with mock.patch("cart.store.time.sleep"):
+            with self.assertRaises(CartBusy):
+                self.store.add(self.user, self.item.id, 1)
+
+        cache.delete(f"{self.store.key(self.user)}:lock")
+        self.assertEqual(self.store.snapshot(self.user).lines, [])
+
+    def test_checkout_holds_the_lock_until_the_document_is_dropped(self):
+        self.store.add(self.user, self.item.id, 2)
+
+        with self.store.checking_out(self.user):
+            self.assertEqual(self.saved_lines(), [(self.item.id, 2)])
+            with mock.patch("cart.store.time.sleep"):
+                with self.assertRaises(CartBusy):
+                    self.store.add(self.user, self.item.id, 1)
+
+        self.assertIsNone(cache.get(self.store.key(self.user)))
+
+    def test_failed_checkout_keeps_the_document(self):
+        self.store.add(self.user, self.item.id, 2)
+
+        with self.assertRaises(ValueError):
+            with self.store.checking_out(self.user):
+                raise ValueError
+
+        self.assertIsNotNone(cache.get(self.store.key(self.user)))
+        self.store.add(self.user, self.item.id, 1)
+        self.assertEqual(self.store.snapshot(self.user).lines[0].quantity, 3)
@@ -4,5 +4,6 @@ from .views import *
 urlpatterns = [
     path("", CartDetailView.as_view(), name="cart-detail"),
     path("add/", AddToCartView.as_view(), name="cart-add"),
+    path("batch/", CartBatchView.as_view(), name="cart-batch"),
     path("item/<int:pk>/", UpdateCartItemView.as_view(), name="cart-item-update"),
 ]
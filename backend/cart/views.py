@@ -1,19 +1,28 @@
 from django.shortcuts import render
 from rest_framework.views import APIView
-from rest_framework import permissions, viewsets, generics
+from rest_framework import permissions, viewsets, generics, status
 from rest_framework.response import Response
-from .models  import Cart, CartItem
-from .serializers import CartSerializer, CartItemSerializer
+from menu.prices import price_table
+from .serializers import CartSerializer, cart_data
+from .store import OPS, get_store
+from idempotency.decorators import idempotent
 
 
 # Create your views here.
 
+def parse_quantity(value):
+    quantity = int(value)
+    if quantity < 1:
+        raise ValueError(value)
+    return quantity
+
+
 class CartDetailView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        cart, _ = Cart.objects.get_or_create(user=request.user)
-        serializer = CartSerializer(cart)
+        snapshot = get_store().snapshot(request.user)
+        serializer = CartSerializer(cart_data(snapshot))
         return Response(serializer.data)
 
 
@@ -22,21 +31,21 @@ class CartDetailView(APIView):
 class AddToCartView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
+    @idempotent
     def post(self, request):
-        cart, _ = Cart.objects.get_or_create(user=request.user)
-
-        menu_item_id = request.data.get('menu_item')
-        quantity = int(request.data.get('quantity', 1))
-
-        item, created = CartItem.objects.get_or_create(
-            cart=cart,
-            menu_item_id=menu_item_id
-        )
-
-        if not created:
-            item.quantity += quantity
-
-        item.save()
+        try:
+            menu_item_id = int(request.data.get('menu_item'))
+            quantity = parse_quantity(request.data.get('quantity', 1))
+        except (TypeError, ValueError):
+            return Response(
+                {'error': 'menu_item and a positive quantity are required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if menu_item_id not in price_table():
+            return Response({'error': 'Menu item does not exist'}, status=status.HTTP_400_BAD_REQUEST)
+
+        get_store().add(request.user, menu_item_id, quantity)
         return Response({'message': 'Item added successfully!'})
 
 
@@ -44,12 +53,68 @@ class UpdateCartItemView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def patch(self,request,pk):
-        item = CartItem.objects.get(pk = pk, cart = request.user.cart)
-        item.quantity = request.data.get('quantity',item.quantity)
-        item.save()
+        try:
+            quantity = parse_quantity(request.data.get('quantity'))
+        except (TypeError, ValueError):
+            return Response({'error': 'quantity must be a positive number'}, status=status.HTTP_400_BAD_REQUEST)
+
+        if not get_store().set_quantity(request.user, pk, quantity):
+            return Response({'error': 'Item not in cart'}, status=status.HTTP_404_NOT_FOUND)
         return Response({'message':'Item updated successfully!'})
 
     def delete(self,request,pk):
-        item = CartItem.objects.get(pk = pk, cart = request.user.cart)
-        item.delete()
+        if not get_store().remove(request.user, pk):
+            return Response({'error': 'Item not in cart'}, status=status.HTTP_404_NOT_FOUND)
         return Response({'message':'Item deleted successfully!'})
+
+
+class CartBatchView(APIView):
+    """
+    POST /api/cart/batch/
+    [{"menu_item": 3, "quantity": 2, "op": "add"}, {"menu_item": 5, "op": "remove"}]
+
+    `op` is add (default), set or remove; operations apply in order, in
+    one transaction. Responds with the resulting cart.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+    max_ops = 100
+
+    @idempotent
+    def post(self, request):
+        ops = request.data
+        if not isinstance(ops, list) or not ops:
+            return Response({'error': 'Expected a list of operations'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(ops) > self.max_ops:
+            return Response(
+                {'error': f'At most {self.max_ops} operations per request'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        parsed = []
+        for index, entry in enumerate(ops):
+            try:
+                op = entry.get('op', 'add')
+                menu_item_id = int(entry['menu_item'])
+                quantity = None if op == 'remove' else parse_quantity(entry.get('quantity', 1))
+            except (AttributeError, KeyError, TypeError, ValueError):
+                op = None
+            if op not in OPS:
+                return Response(
+                    {'error': f'Invalid operation at index {index}'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            parsed.append((op, menu_item_id, quantity))
+
+        prices = price_table()
+        missing = {menu_item_id for op, menu_item_id, _ in parsed if op != 'remove' and menu_item_id not in prices}
+        if missing:
+            return Response(
+                {'error': 'Menu item does not exist', 'menu_items': sorted(missing)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        store = get_store()
+        store.apply(request.user, parsed)
+        serializer = CartSerializer(cart_data(store.snapshot(request.user)))
+        return Response(serializer.data)
@@ -0,0 +1,10 @@
+from django.contrib import admin
+from .models import IdempotencyKey
+
+# Register your models here.
+
+@admin.register(IdempotencyKey)
+class IdempotencyKeyAdmin(admin.ModelAdmin):
+    list_display = ("key", "user", "status_code", "created_at")
+    search_fields = ("key", "user__username")
+    readonly_fields = ("created_at",)
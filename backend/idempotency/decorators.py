@@ -0,0 +1,128 @@
+import hashlib
+import json
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+
+def fingerprint(request):
+    """
+    sha256 of the method, path and parsed request data. Uploads count by
+    name, size and a hash of their content read in chunks, so a large
+    multipart body is never loaded through request.body.
+    """
+    digest = hashlib.sha256()
+    digest.update(request.method.encode())
+    digest.update(request.get_full_path().encode())
+
+    data = request.data
+    if hasattr(data, "lists"):
+        # form / multipart QueryDict; files are hashed separately below
+        data = sorted(
+            (name, value)
+            for name, values in data.lists()
+            for value in values
+            if not isinstance(value, UploadedFile)
+        )
+    digest.update(json.dumps(data, sort_keys=True, cls=DjangoJSONEncoder).encode())
+
+    for name, uploads in sorted(request.FILES.lists()):
+        for upload in uploads:
+            digest.update(f"{name}:{upload.name}:{upload.size}:".encode())
+            for chunk in upload.chunks():
+                digest.update(chunk)
+            upload.seek(0)
+
+    return digest.hexdigest()
+
+
+def replay(record):
+    response = Response(record.response_body, status=record.status_code)
+    response["Idempotent-Replayed"] = "true"
+    return response
+
+
+def idempotent(view_method):
+    """
+    Honour an `Idempotency-Key` header on an APIView handler.
+
+    The key row is inserted in the same transaction as the handler's work,
+    so either both commit or neither does. A retry with the same key is
+    answered from the stored response by a single lookup on the unique
+    (user, key) index; a concurrent duplicate blocks on that index until
+    the first request commits and is then replayed. 5xx responses are
+    not stored, so they can be retried. Requests without the header run
+    as before.
+    """
+
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if not key or not request.user.is_authenticated:
+            return view_method(self, request, *args, **kwargs)
+
+        if len(key) > MAX_KEY_LENGTH:
+            return Response(
+                {"error": f"{HEADER} must be at most {MAX_KEY_LENGTH} characters"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        request_fingerprint = fingerprint(request)
+        cutoff = timezone.now() - timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+
+        def lookup():
+            record = IdempotencyKey.objects.filter(user=request.user, key=key).first()
+            if record is not None and record.created_at < cutoff:
+                # expired but not purged yet: the key is free again
+                record.delete()
+                return None
+            return record
+
+        def answer(record):
+            if record.fingerprint != request_fingerprint:
+                return Response(
+                    {"error": f"{HEADER} was already used for a different request"},
+                    status=status.HTTP_422_UNPROCESSABLE_ENTITY
+                )
+            return replay(record)
+
+        record = lookup()
+        if record is not None:
+            return answer(record)
+
+        with transaction.atomic():
+            try:
+                with transaction.atomic():
+                    record = IdempotencyKey.objects.create(
+                        user=request.user,
+                        key=key,
+                        fingerprint=request_fingerprint,
+                    )
+            except IntegrityError:
+                # a concurrent request with the same key committed first
+                return answer(IdempotencyKey.objects.get(user=request.user, key=key))
+
+            response = view_method(self, request, *args, **kwargs)
+
+            if response.status_code >= 500:
+                transaction.set_rollback(True)
+                return response
+
+            record.status_code = response.status_code
+            record.response_body = response.data
+            record.save(update_fields=["status_code", "response_body"])
+            return response
+
+    return wrapper
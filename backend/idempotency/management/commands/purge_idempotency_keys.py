@@ -0,0 +1,29 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from idempotency.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    help = "Delete idempotency keys older than IDEMPOTENCY_KEY_TTL_HOURS, in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+        expired = IdempotencyKey.objects.filter(created_at__lt=cutoff).order_by("created_at")
+
+        purged = 0
+        while True:
+            # bounded batches keep each DELETE (and its locks) short
+            ids = list(expired.values_list("id", flat=True)[: options["batch_size"]])
+            if not ids:
+                break
+            deleted, _ = IdempotencyKey.objects.filter(id__in=ids).delete()
+            purged += deleted
+
+        self.stdout.write(self.style.SUCCESS(f"Purged {purged} idempotency key(s)."))
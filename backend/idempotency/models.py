@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+# Create your models here.
+
+
+class IdempotencyKey(models.Model):
+    """A client supplied Idempotency-Key and the response it produced."""
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='+',
+    )
+    key = models.CharField(max_length=255)
+    # sha256 of method + path + parsed data (see decorators.fingerprint);
+    # the same key with a different request is rejected
+    fingerprint = models.CharField(max_length=64)
+
+    status_code = models.PositiveSmallIntegerField(null=True)
+    response_body = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "key"], name="idempotency_user_key_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id}:{self.key}"
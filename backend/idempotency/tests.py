@@ -0,0 +1,89 @@
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework.views import APIView
+
+from .decorators import HEADER, idempotent
+from .models import IdempotencyKey
+
+User = get_user_model()
+
+
+class CountingView(APIView):
+    parser_classes = [JSONParser, MultiPartParser, FormParser]
+    calls = 0
+
+    @idempotent
+    def post(self, request):
+        CountingView.calls += 1
+        upload = request.FILES.get("image")
+        return Response(
+            {
+                "call": CountingView.calls,
+                "title": request.data.get("title"),
+                "size": upload.size if upload else None,
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class IdempotentDecoratorTests(TestCase):
+    def setUp(self):
+        CountingView.calls = 0
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(username="idem", email="idem@example.com", password="x")
+
+    def post(self, data, key="key-1", format="json"):
+        request = self.factory.post(
+            "/idempotent/", data, format=format, **{f"HTTP_{HEADER.upper().replace('-', '_')}": key}
+        )
+        force_authenticate(request, user=self.user)
+        return CountingView.as_view()(request)
+
+    def test_retry_is_replayed(self):
+        first = self.post({"title": "momo"})
+        second = self.post({"title": "momo"})
+
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second["Idempotent-Replayed"], "true")
+        self.assertEqual(CountingView.calls, 1)
+
+    def test_reused_key_with_different_request_is_rejected(self):
+        self.post({"title": "momo"})
+        response = self.post({"title": "chowmein"})
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(CountingView.calls, 1)
+
+    def test_without_header_runs_every_time(self):
+        for _ in range(2):
+            request = self.factory.post("/idempotent/", {"title": "momo"}, format="json")
+            force_authenticate(request, user=self.user)
+            CountingView.as_view()(request)
+
+        self.assertEqual(CountingView.calls, 2)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    @override_settings(DATA_UPLOAD_MAX_MEMORY_SIZE=1024)
+    def test_large_multipart_upload_is_replayed(self):
+        content = b"\x89PNG" + b"0" * 8192
+
+        def upload(body):
+            return {"title": "momo", "image": SimpleUploadedFile("momo.png", body, "image/png")}
+
+        first = self.post(upload(content), format="multipart")
+        second = self.post(upload(content), format="multipart")
+        changed = self.post(upload(content[:-1] + b"1"), format="multipart")
+
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(first.data["size"], len(content))
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second["Idempotent-Replayed"], "true")
+        self.assertEqual(changed.status_code, 422)
+        self.assertEqual(CountingView.calls, 1)
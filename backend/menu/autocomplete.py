@@ -0,0 +1,133 @@
+"""
+In-process autocomplete index over Food names.
+
+Lookups never touch the database: the index is a sorted array of every
+word-start of every food name (bisect for prefixes) plus a trigram map
+for typo-tolerant fallback. It is built lazily on first use and rebuilt
+when Food changes, signalled through a version number in the shared
+cache (so every worker notices) with a max age as a backstop for
+per-process caches.
+"""
+
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+
+from backend.versioning import VersionedKey
+
+VERSION = VersionedKey("menu:food-autocomplete")
+MAX_AGE = 300  # seconds before a rebuild even without a version bump
+MIN_SIMILARITY = 0.3
+
+
+def normalize(text):
+    return " ".join(re.findall(r"\w+", text.lower()))
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class FoodIndex:
+    def __init__(self, foods):
+        # foods: iterable of (id, name)
+        self.names = {}
+        self.gram_counts = {}
+        keys = []
+        grams = {}
+
+        for food_id, name in foods:
+            self.names[food_id] = name
+            normalized = normalize(name)
+            words = normalized.split(" ")
+            for i in range(len(words)):
+                keys.append((" ".join(words[i:]), i, food_id))
+            name_grams = trigrams(normalized)
+            self.gram_counts[food_id] = len(name_grams)
+            for gram in name_grams:
+                grams.setdefault(gram, []).append(food_id)
+
+        keys.sort()
+        self.keys = keys
+        self.grams = grams
+
+    def prefix(self, query, limit):
+        """Foods with a word starting with `query`; whole-name matches first."""
+        matches = []
+        for i in range(bisect_left(self.keys, (query,)), len(self.keys)):
+            key, position, food_id = self.keys[i]
+            if not key.startswith(query):
+                break
+            matches.append((position, len(key), food_id))
+
+        seen = set()
+        ordered = []
+        for _, _, food_id in sorted(matches):
+            if food_id not in seen:
+                seen.add(food_id)
+                ordered.append(food_id)
+                if len(ordered) == limit:
+                    break
+        return ordered
+
+    def similar(self, query, limit, exclude=()):
+        query_grams = trigrams(query)
+        shared = Counter()
+        for gram in query_grams:
+            for food_id in self.grams.get(gram, ()):
+                shared[food_id] += 1
+
+        scored = []
+        for food_id, common in shared.items():
+            if food_id in exclude:
+                continue
+            similarity = common / (len(query_grams) + self.gram_counts[food_id] - common)
+            if similarity >= MIN_SIMILARITY:
+                scored.append((-similarity, self.names[food_id], food_id))
+
+        return [food_id for _, _, food_id in sorted(scored)[:limit]]
+
+    def search(self, text, limit=10):
+        query = normalize(text)
+        if not query:
+            return []
+
+        ids = self.prefix(query, limit)
+        if len(ids) < limit and len(query) >= 3:
+            ids += self.similar(query, limit - len(ids), exclude=set(ids))
+
+        return [{"id": food_id, "name": self.names[food_id]} for food_id in ids]
+
+
+_lock = threading.Lock()
+_index = None
+_built_version = None
+_built_at = 0.0
+
+
+current_version = VERSION.current
+mark_stale = VERSION.bump
+
+
+def get_index():
+    global _index, _built_version, _built_at
+
+    version = current_version()
+    if _index is not None and version == _built_version and time.monotonic() - _built_at < MAX_AGE:
+        return _index
+
+    with _lock:
+        if _index is None or version != _built_version or time.monotonic() - _built_at >= MAX_AGE:
+            from .models import Food
+
+            _index = FoodIndex(Food.objects.values_list("id", "name").iterator())
+            _built_version = version
+            _built_at = time.monotonic()
+        return _index
+
+
+def autocomplete(text, limit=10):
+    return get_index().search(text, limit)
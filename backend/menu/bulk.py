@@ -0,0 +1,231 @@
+"""
+Bulk menu import / price update.
+
+Rows are {"food", "description", "is_veg", "menu_item", "price",
+"available"}; only "food" (the name) is required. Foods are matched by
+name case-insensitively and created when missing. Each row updates the
+menu item given by "menu_item" (an id) or else the food's first menu
+item, creating one when the food has none. The whole batch is validated
+first and applied in one transaction with bulk inserts/updates, so no
+per-row signals fire; a single catalog_changed signal is sent after
+commit instead.
+"""
+
+import csv
+import io
+import json
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from search.indexing import index_objects
+from search.models import SearchDocument
+from .models import Food, MenuItems
+from .signals import catalog_changed
+
+TRUE = {"1", "true", "yes", "y"}
+FALSE = {"0", "false", "no", "n"}
+BATCH_SIZE = 500
+GROUPED_UPDATE_LIMIT = 200  # distinct prices before falling back to bulk_update
+
+
+class MenuImportError(ValueError):
+    def __init__(self, errors):
+        super().__init__(errors)
+        self.errors = errors
+
+
+def read_rows(handle, name):
+    """Rows from an uploaded or opened CSV/JSON file (text or bytes)."""
+    text = handle.read()
+    if isinstance(text, bytes):
+        text = text.decode("utf-8-sig")
+
+    if name.endswith(".json"):
+        rows = json.loads(text)
+    else:
+        rows = list(csv.DictReader(io.StringIO(text)))
+
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        raise ValueError("Expected a list of rows")
+    return rows
+
+
+def parse_bool(value):
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in TRUE:
+        return True
+    if text in FALSE:
+        return False
+    raise ValueError(value)
+
+
+def blank(value):
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def clean(rows):
+    """Validate every row; raises MenuImportError listing all problems."""
+    cleaned, errors = [], []
+
+    for index, row in enumerate(rows):
+        problems = []
+        name = (row.get("food") or "").strip().lower()
+        if not name:
+            problems.append("food is required")
+
+        entry = {"index": index, "name": name}
+        try:
+            if not blank(row.get("menu_item")):
+                entry["menu_item"] = int(row["menu_item"])
+        except (TypeError, ValueError):
+            problems.append("menu_item must be an id")
+        try:
+            if not blank(row.get("price")):
+                entry["price"] = Decimal(str(row["price"])).quantize(Decimal("0.01"))
+                if entry["price"] < 0:
+                    raise InvalidOperation
+        except InvalidOperation:
+            problems.append("price must be a non-negative number")
+        for field in ("available", "is_veg"):
+            try:
+                if not blank(row.get(field)):
+                    entry[field] = parse_bool(row[field])
+            except ValueError:
+                problems.append(f"{field} must be true or false")
+        if not blank(row.get("description")):
+            entry["description"] = str(row["description"]).strip()
+
+        if problems:
+            errors.append({"index": index, "errors": problems})
+        else:
+            cleaned.append(entry)
+
+    if errors:
+        raise MenuImportError(errors)
+    return cleaned
+
+
+def update_items(items, now):
+    """
+    Write price/available for `items`. Menus have few distinct prices, so
+    one UPDATE ... WHERE id IN (...) per price plus one per availability
+    value is far cheaper than bulk_update's per-row CASE; bulk_update is
+    the fallback when nearly every price differs.
+    """
+    by_price = {}
+    for item in items:
+        by_price.setdefault(item.price, []).append(item.pk)
+
+    if len(by_price) > GROUPED_UPDATE_LIMIT:
+        for item in items:
+            item.updated_at = now
+        MenuItems.objects.bulk_update(items, ["price", "available", "updated_at"], batch_size=BATCH_SIZE)
+        return
+
+    for price, ids in by_price.items():
+        MenuItems.objects.filter(pk__in=ids).update(price=price)
+    for available in (True, False):
+        ids = [item.pk for item in items if item.available == available]
+        if ids:
+            MenuItems.objects.filter(pk__in=ids).update(available=available, updated_at=now)
+
+
+def import_menu(rows):
+    entries = clean(rows)
+    with transaction.atomic():
+        summary = apply(entries)
+        transaction.on_commit(lambda: catalog_changed.send(sender=MenuItems))
+    return summary
+
+
+def apply(entries):
+    now = timezone.now()
+
+    # foods -----------------------------------------------------------------
+    names = {entry["name"] for entry in entries}
+    foods = {
+        food.lname: food
+        for food in Food.objects.annotate(lname=Lower("name")).filter(lname__in=names)
+    }
+
+    new_foods = {name: Food(name=name, created_by_user=False, approved=True) for name in names - foods.keys()}
+
+    changed_foods = {}
+    for entry in entries:
+        food = foods.get(entry["name"]) or new_foods[entry["name"]]
+        for field in ("description", "is_veg"):
+            if field in entry and getattr(food, field) != entry[field]:
+                setattr(food, field, entry[field])
+                if food.pk is not None:
+                    changed_foods[food.pk] = food
+
+    created = Food.objects.bulk_create(list(new_foods.values()), batch_size=BATCH_SIZE)
+    if created and created[0].pk is None:
+        # no INSERT ... RETURNING (MySQL)
+        created = list(Food.objects.filter(name__in=new_foods.keys()))
+    foods.update((food.name, food) for food in created)
+
+    for food in changed_foods.values():
+        food.updated_at = now
+    Food.objects.bulk_update(
+        changed_foods.values(), ["description", "is_veg", "updated_at"], batch_size=BATCH_SIZE
+    )
+
+    # menu items ------------------------------------------------------------
+    food_ids = {food.pk for food in foods.values()}
+    wanted_ids = {entry["menu_item"] for entry in entries if "menu_item" in entry}
+    by_id = {
+        item.pk: item
+        for item in MenuItems.objects.filter(pk__in=wanted_ids)
+    }
+    missing = sorted(wanted_ids - by_id.keys())
+    if missing:
+        raise MenuImportError([{"menu_items": missing, "errors": ["menu item does not exist"]}])
+
+    by_food = {}
+    for item in MenuItems.objects.filter(food_id__in=food_ids).order_by("-id"):
+        by_food[item.food_id] = item  # ends on the lowest id per food
+
+    to_update, to_create, errors = {}, {}, []
+    for entry in entries:
+        food = foods[entry["name"]]
+        item = by_id.get(entry.get("menu_item")) or by_food.get(food.pk) or to_create.get(food.pk)
+        if item is not None and item.food_id != food.pk:
+            errors.append({"index": entry["index"], "errors": ["menu_item belongs to another food"]})
+            continue
+        if item is None:
+            if "price" not in entry:
+                errors.append({"index": entry["index"], "errors": ["price is required for a new menu item"]})
+                continue
+            item = to_create[food.pk] = MenuItems(food=food, price=entry["price"], available=False)
+
+        changed = False
+        for field in ("price", "available"):
+            if field in entry and getattr(item, field) != entry[field]:
+                setattr(item, field, entry[field])
+                changed = True
+        if changed and item.pk is not None:
+            to_update[item.pk] = item
+
+    if errors:
+        raise MenuImportError(errors)
+
+    MenuItems.objects.bulk_create(list(to_create.values()), batch_size=BATCH_SIZE)
+    update_items(list(to_update.values()), now)
+
+    # bulk writes skip the search signals
+    touched = created + list(changed_foods.values())
+    SearchDocument.objects.filter(kind="food", object_id__in=[food.pk for food in touched]).delete()
+    index_objects("food", touched)
+
+    return {
+        "foods_created": len(created),
+        "foods_updated": len(changed_foods),
+        "items_created": len(to_create),
+        "items_updated": len(to_update),
+    }
@@ -0,0 +1,71 @@
+"""
+The menu list, pre-serialized.
+
+GET /api/menu/menu-items is read on every app open but changes a few
+times a day, so the whole list is rendered once into JSON bytes and kept
+in the shared cache under a version number, with a per-process copy for
+that version. A steady-state read is one cache get of the version and no
+database query; the ETag is a hash of the bytes. Any Food or MenuItems
+change bumps the version (menu.signals) and the next read rebuilds.
+
+Only the first page (PAGE_SIZE items, as CatalogPagination would return
+it) is precomputed; the view wraps it in the paginated envelope, and
+later pages are served live.
+"""
+
+import hashlib
+import threading
+
+from django.core.cache import cache
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+
+from backend.versioning import VersionedKey
+
+VERSION = VersionedKey("menu:catalog")
+BLOB_TIMEOUT = 24 * 3600
+
+_lock = threading.Lock()
+_blob = None
+_blob_version = None
+
+
+current_version = VERSION.current
+mark_stale = VERSION.bump
+
+
+def render():
+    """
+    (etag, count, has_next, results) for the first page of the menu;
+    `results` is the JSON bytes of MenuItemSerializer's list.
+    """
+    from .models import MenuItems
+    from .serializers import MenuItemSerializer
+
+    limit = api_settings.PAGE_SIZE
+    items = list(MenuItems.objects.select_related("food").order_by("id")[:limit + 1])
+    count = len(items) if len(items) <= limit else MenuItems.objects.count()
+    results = JSONRenderer().render(MenuItemSerializer(items[:limit], many=True).data)
+
+    digest = hashlib.sha1(results)
+    digest.update(str(count).encode())
+    return f'"{digest.hexdigest()}"', count, len(items) > limit, results
+
+
+def get_catalog():
+    global _blob, _blob_version
+
+    version = current_version()
+    if _blob is not None and _blob_version == version:
+        return _blob
+
+    with _lock:
+        if _blob is None or _blob_version != version:
+            key = VERSION.key(version=version)
+            blob = cache.get(key)
+            if blob is None:
+                blob = render()
+                cache.set(key, blob, BLOB_TIMEOUT)
+            _blob = blob
+            _blob_version = version
+        return _blob
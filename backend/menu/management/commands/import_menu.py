@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from menu.bulk import MenuImportError, import_menu, read_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Upsert foods and menu items from a CSV or JSON file with food, description, "
+        "is_veg, menu_item, price, available. All rows apply in one transaction or none do."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        try:
+            with open(path, "rb") as handle:
+                rows = read_rows(handle, path)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Could not read {path}: {e}")
+
+        try:
+            summary = import_menu(rows)
+        except MenuImportError as e:
+            for error in e.errors:
+                self.stderr.write(str(error))
+            raise CommandError("Nothing was imported.")
+
+        self.stdout.write(self.style.SUCCESS(
+            "Foods: {foods_created} created, {foods_updated} updated. "
+            "Menu items: {items_created} created, {items_updated} updated.".format(**summary)
+        ))
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.14 on 2026-10-18 13:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('menu', '0003_alter_food_created_by_user'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='food',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='menuitems',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
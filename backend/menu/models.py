@@ -10,6 +10,7 @@ class Food(models.Model):
     approved = models.BooleanField(default = False)
 
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
@@ -20,6 +21,7 @@ class MenuItems(models.Model):
     available = models.BooleanField(default = False)
 
     image = models.ImageField(upload_to='menu_images',blank=True,null=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
 
 
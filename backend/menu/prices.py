@@ -0,0 +1,82 @@
+"""
+Cached price table: {menu_item_id: MenuPrice(food_name, price, available)}.
+
+Cart responses and checkout price lines from this table instead of
+joining MenuItems and Food per request. The table is built with one
+query, stored in the shared cache under a version number, and memoized
+per process for that version. The version is bumped (menu.signals) only
+when a menu item is added or removed, or its price, availability or food
+name changes.
+"""
+
+import threading
+from collections import namedtuple
+from decimal import Decimal
+
+from django.core.cache import cache
+
+from backend.versioning import VersionedKey
+
+VERSION = VersionedKey("menu:prices")
+TABLE_TIMEOUT = 24 * 3600
+
+MenuPrice = namedtuple("MenuPrice", "food_name price available")
+
+_lock = threading.Lock()
+_table = None
+_table_version = None
+
+
+current_version = VERSION.current
+mark_stale = VERSION.bump
+
+
+def build():
+    from .models import MenuItems
+
+    return {
+        menu_item_id: MenuPrice(food_name, price, available)
+        for menu_item_id, food_name, price, available in MenuItems.objects.values_list(
+            "id", "food__name", "price", "available"
+        ).iterator()
+    }
+
+
+def price_table():
+    global _table, _table_version
+
+    version = current_version()
+    if _table is not None and _table_version == version:
+        return _table
+
+    with _lock:
+        if _table is None or _table_version != version:
+            key = VERSION.key(version=version)
+            table = cache.get(key)
+            if table is None:
+                table = build()
+                cache.set(key, table, TABLE_TIMEOUT)
+            _table = table
+            _table_version = version
+        return _table
+
+
+def price_lines(lines, prices=None):
+    """
+    Price (menu_item_id, quantity) pairs from the cached price table.
+
+    Returns [(menu_item_id, quantity, MenuPrice or None, subtotal)] and the
+    total over available lines; unavailable or unknown items have no
+    subtotal and are left out of the total.
+    """
+    prices = price_table() if prices is None else prices
+    priced = []
+    total = Decimal("0")
+    for menu_item_id, quantity in lines:
+        entry = prices.get(menu_item_id)
+        subtotal = None
+        if entry is not None and entry.available:
+            subtotal = entry.price * quantity
+            total += subtotal
+        priced.append((menu_item_id, quantity, entry, subtotal))
+    return priced, total
@@ -0,0 +1,64 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import Signal, receiver
+from .models import Food, MenuItems
+from .autocomplete import mark_stale
+from . import catalog, prices
+
+
+# sent once after bulk menu writes (menu.bulk), which bypass the per-row
+# signals below
+catalog_changed = Signal()
+
+
+@receiver(catalog_changed)
+def refresh_menu_caches(sender, **kwargs):
+    mark_stale()
+    catalog.mark_stale()
+    prices.mark_stale()
+
+
+@receiver(post_save, sender=Food)
+@receiver(post_delete, sender=Food)
+def refresh_food_autocomplete(sender, **kwargs):
+    transaction.on_commit(mark_stale)
+
+
+@receiver(post_save, sender=Food)
+@receiver(post_delete, sender=Food)
+@receiver(post_save, sender=MenuItems)
+@receiver(post_delete, sender=MenuItems)
+def refresh_catalog(sender, **kwargs):
+    transaction.on_commit(catalog.mark_stale)
+
+
+# price table: only changes that alter what it holds invalidate it
+
+@receiver(pre_save, sender=MenuItems)
+def note_price_change(sender, instance, **kwargs):
+    previous = None
+    if instance.pk is not None:
+        previous = MenuItems.objects.filter(pk=instance.pk).values_list("price", "available", "food_id").first()
+    instance._prices_stale = previous != (instance.price, instance.available, instance.food_id)
+
+
+@receiver(pre_save, sender=Food)
+def note_food_rename(sender, instance, **kwargs):
+    previous = None
+    if instance.pk is not None:
+        previous = Food.objects.filter(pk=instance.pk).values_list("name", flat=True).first()
+    # also read by search.signals, which reindexes posts naming the food
+    instance._renamed = previous is not None and previous != instance.name
+    instance._prices_stale = instance._renamed
+
+
+@receiver(post_save, sender=MenuItems)
+@receiver(post_save, sender=Food)
+def refresh_price_table(sender, instance, **kwargs):
+    if getattr(instance, "_prices_stale", False):
+        transaction.on_commit(prices.mark_stale)
+
+
+@receiver(post_delete, sender=MenuItems)
+def drop_from_price_table(sender, **kwargs):
+    transaction.on_commit(prices.mark_stale)
@@ -1,3 +1,136 @@
+import unittest
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from backend.pagination import estimate_count
+from search.backends import search_ids
+from . import autocomplete
+from .models import Food, MenuItems
+
+ESTIMATING_VENDORS = ("postgresql", "mysql")
+
+
+class CatalogPaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_search_results_page_in_rank_order(self):
+        weak = Food.objects.create(name="momo", description="plain", approved=True)
+        strong = Food.objects.create(name="chicken momo", description="momo momo momo momo", approved=True)
+        Food.objects.create(name="chowmein", approved=True)
+
+        ranked = search_ids("momo", "food", 500)
+        self.assertEqual(ranked, [strong.id, weak.id])
+
+        first = self.client.get("/api/menu/food/?search=momo&limit=1").json()
+        second = self.client.get(first["next"]).json()
+        self.assertEqual(first["count"], 2)
+        self.assertEqual([food["id"] for food in first["results"] + second["results"]], ranked)
+        self.assertIsNone(second["next"])
+
+    def test_unordered_lists_page_by_id(self):
+        foods = Food.objects.bulk_create([Food(name=f"dish {i}", approved=i % 2 == 0) for i in range(5)])
+
+        page = self.client.get("/api/menu/food/?limit=2&offset=2&approved=true").json()
+        approved = [food.id for food in foods if food.approved]
+        self.assertEqual(page["count"], 3)
+        self.assertEqual([food["id"] for food in page["results"]], approved[2:])
+        self.assertIsNotNone(page["previous"])
+
+    def test_cursor_refused_for_ranked_results(self):
+        Food.objects.create(name="momo", approved=True)
+
+        response = self.client.get("/api/menu/food/?search=momo&cursor=")
+        self.assertEqual(response.status_code, 400)
+
+    def test_cursor_pages_by_id(self):
+        food = Food.objects.create(name="momo", approved=True)
+        items = MenuItems.objects.bulk_create([MenuItems(food=food, price=100 + i, available=True) for i in range(5)])
+
+        seen, url = [], "/api/menu/menu-items?cursor=&limit=2"
+        while url:
+            page = self.client.get(url).json()
+            seen += [item["id"] for item in page["results"]]
+            url = page["next"]
+        self.assertEqual(seen, [item.id for item in items])
+
+    @unittest.skipIf(connection.vendor in ESTIMATING_VENDORS, "planner estimates used instead")
+    def test_estimate_falls_back_to_exact_count(self):
+        Food.objects.bulk_create([Food(name=f"dish {i}") for i in range(3)])
+
+        self.assertIsNone(estimate_count(Food.objects.all()))
+        page = self.client.get("/api/menu/food/?count=estimate&limit=1").json()
+        self.assertEqual(page["count"], 3)
+
+    @unittest.skipUnless(connection.vendor in ESTIMATING_VENDORS, "no planner estimate on this database")
+    def test_estimate_reads_the_planner(self):
+        Food.objects.bulk_create([Food(name=f"dish {i}") for i in range(2000)])
+        with connection.cursor() as cursor:
+            table = connection.ops.quote_name(Food._meta.db_table)
+            cursor.execute(f"ANALYZE TABLE {table}" if connection.vendor == "mysql" else f"ANALYZE {table}")
+
+        estimate = estimate_count(Food.objects.all())
+        self.assertIsNotNone(estimate)
+        self.assertTrue(1000 <= estimate <= 4000, estimate)
+
+        page = self.client.get("/api/menu/food/?count=estimate&limit=1").json()
+        self.assertEqual(page["count"], estimate)
+
+    def test_count_none_skips_counting(self):
+        Food.objects.create(name="momo")
+
+        page = self.client.get("/api/menu/food/?count=none").json()
+        self.assertIsNone(page["count"])
+        self.assertEqual(len(page["results"]), 1)
+
+
+class FoodAutocompleteTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        autocomplete._index = None
+        self.client = APIClient()
+        self.chicken = Food.objects.create(name="Chicken Momo")
+        self.momo = Food.objects.create(name="momo")
+        self.chowmein = Food.objects.create(name="chowmein")
+
+    def names(self, query, limit=10):
+        response = self.client.get("/api/menu/food/autocomplete/", {"q": query, "limit": limit})
+        self.assertEqual(response.status_code, 200)
+        return [food["name"] for food in response.json()]
+
+    def test_prefixes_match_any_word_whole_names_first(self):
+        self.assertEqual(self.names("mo"), ["momo", "Chicken Momo"])
+        self.assertEqual(self.names("CH"), ["chowmein", "Chicken Momo"])
+        self.assertEqual(self.names("chicken m"), ["Chicken Momo"])
+        self.assertEqual(self.names("mo", limit=1), ["momo"])
+        self.assertEqual(self.names("  "), [])
+
+    def test_typos_fall_back_to_trigrams(self):
+        self.assertEqual(self.names("momoo"), ["momo"])
+        self.assertEqual(self.names("chowmin"), ["chowmein"])
+        self.assertEqual(self.names("pizza"), [])
+
+    def test_no_trigram_fallback_under_three_characters(self):
+        index = autocomplete.FoodIndex([(1, "tea")])
+        # loose enough that two letters would match without the cutoff
+        with mock.patch.object(autocomplete, "MIN_SIMILARITY", 0.1):
+            self.assertEqual(index.similar("ta", 5), [1])
+            self.assertEqual(index.search("ta"), [])
+            self.assertEqual(index.search("tae"), [{"id": 1, "name": "tea"}])
+
+    def test_index_follows_food_changes(self):
+        self.assertEqual(self.names("thuk"), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Food.objects.create(name="thukpa")
+        self.assertEqual(self.names("thuk"), ["thukpa"])
 
-# Create your tests here.
+        with self.captureOnCommitCallbacks(execute=True):
+            self.chowmein.name = "sel roti"
+            self.chowmein.save()
+        self.assertEqual(self.names("chowmein"), [])
+        self.assertEqual(self.names("rot"), ["sel roti"])
@@ -8,5 +8,7 @@ urlpatterns = [
 
     path("menu-items",MenuItemListApiView.as_view(),name="menu-list-create"),
     path("menu-items/<int:pk>",MenuItemRetrieveUpdateDestroyAPIView.as_view(),name="menu-detail"),
+    path("menu-items/import/",MenuImportView.as_view(),name="menu-import"),
     path("food/get-or-create/",FoodGetOrCreateView.as_view()),
+    path("food/autocomplete/",FoodAutocompleteView.as_view(),name="food-autocomplete"),
 ]
\ No newline at end of file
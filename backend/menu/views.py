@@ -1,10 +1,20 @@
+import json
+
 from django.shortcuts import render
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import generics, permissions, status
+from rest_framework.renderers import BrowsableAPIRenderer
 from .models import MenuItems,Food
 from .permissions import IsAuthenticatedOrReadOnlyCreate, IsAdminOrReadOnly, IsStaffOrReadOnly
 from .serializers import FoodSerializer, MenuItemSerializer
+from .autocomplete import autocomplete
+from .catalog import get_catalog
+from .bulk import MenuImportError, import_menu, read_rows
+from backend.conditional import add_validators, not_modified_response
+from backend.filters import BooleanFieldFilter
+from backend.renderers import PrerenderedJSONRenderer
+from search.filters import FullTextSearchFilter
 
 
 
@@ -13,7 +23,9 @@ class FoodListCreateAPIView(generics.ListCreateAPIView):
     queryset = Food.objects.all()
     serializer_class = FoodSerializer
     permission_classes = [IsAuthenticatedOrReadOnlyCreate]
-    search_fields = ['name']
+    filter_backends = [FullTextSearchFilter, BooleanFieldFilter]
+    filter_fields = {'approved': 'approved', 'is_veg': 'is_veg'}
+    search_kind = 'food'
 
 
 class FoodGetOrCreateView(APIView):
@@ -48,16 +60,63 @@ class FoodGetOrCreateView(APIView):
         
     
 
+class FoodAutocompleteView(APIView):
+    permission_classes = [permissions.AllowAny]
+    max_limit = 20
+
+    def get(self, request):
+        try:
+            limit = min(int(request.query_params.get("limit", 10)), self.max_limit)
+        except ValueError:
+            limit = 10
+
+        return Response(autocomplete(request.query_params.get("q", ""), max(limit, 1)))
+
+
 class FoodRetriveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
     queryset = Food.objects.all()
     serializer_class = FoodSerializer
     permission_classes = [IsAdminOrReadOnly]
 
 class MenuItemListApiView(generics.ListAPIView):
-    queryset = MenuItems.objects.all()
+    queryset = MenuItems.objects.select_related('food')
     serializer_class = MenuItemSerializer
     permission_classes = [IsStaffOrReadOnly]
-    search_fields = ['name']
+    renderer_classes = [PrerenderedJSONRenderer, BrowsableAPIRenderer]
+    filter_backends = [FullTextSearchFilter, BooleanFieldFilter]
+    filter_fields = {
+        'available': 'available',
+        'approved': 'food__approved',
+        'is_veg': 'food__is_veg',
+    }
+    search_kind = 'food'
+    search_id_field = 'food_id'
+
+    def list(self, request, *args, **kwargs):
+        if request.query_params:
+            # searches, filters and later pages are served live
+            return super().list(request, *args, **kwargs)
+
+        # the first page is precomputed bytes (see menu.catalog), sent
+        # through PrerenderedJSONRenderer as they are
+        etag, count, has_next, results = get_catalog()
+        response = not_modified_response(request, etag)
+        if response is not None:
+            return response
+
+        next_link = None
+        if has_next:
+            paginator = self.paginator
+            next_link = request.build_absolute_uri(
+                f"?{paginator.limit_query_param}={paginator.get_limit(request)}"
+                f"&{paginator.offset_query_param}={paginator.get_limit(request)}"
+            )
+        body = b"".join([
+            b'{"count":', str(count).encode(),
+            b',"next":', json.dumps(next_link).encode(),
+            b',"previous":null,"results":', results, b"}",
+        ])
+        return add_validators(Response(body), etag)
 
 class MenuItemCreateAPIView(generics.CreateAPIView):
     queryset = MenuItems.objects.all()
@@ -69,3 +128,31 @@ class MenuItemRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView
     queryset = MenuItems.objects.all()
     serializer_class = MenuItemSerializer
     permission_classes =[IsAdminOrReadOnly]
+
+
+class MenuImportView(APIView):
+    """
+    POST /api/menu/menu-items/import/
+
+    Staff only. Body is a JSON list of rows, or a multipart `file` (.csv or
+    .json); see menu.bulk for the row format. All rows apply or none do.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def post(self, request):
+        upload = request.FILES.get("file")
+        try:
+            rows = read_rows(upload, upload.name) if upload else request.data
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if not isinstance(rows, list):
+            return Response({"error": "Expected a list of rows"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            summary = import_menu(rows)
+        except MenuImportError as e:
+            return Response({"error": "Nothing was imported", "rows": e.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(summary, status=status.HTTP_200_OK)
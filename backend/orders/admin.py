@@ -1,13 +1,73 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 
-from .models import Order
+from .models import ArchivedOrder, DailyMenuItemSales, Order, OrderStatusEvent
 # Register your models here.
 
+
+def transition_action(to_status, description):
+    def action(modeladmin, request, queryset):
+        moved = queryset.transition(to_status, changed_by=request.user)
+        skipped = queryset.count() - len(moved)
+        modeladmin.message_user(request, f"{len(moved)} order(s) marked {to_status}.", messages.SUCCESS)
+        if skipped:
+            modeladmin.message_user(
+                request, f"{skipped} order(s) skipped: they cannot move to {to_status}.", messages.WARNING
+            )
+
+    action.__name__ = f"mark_{to_status}"
+    action.short_description = description
+    return action
+
+
+class OrderStatusEventInline(admin.TabularInline):
+    model = OrderStatusEvent
+    fields = ("from_status", "to_status", "changed_by", "created_at")
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(Order)
 class OrderAdmin(admin.ModelAdmin):
     model = Order
     list_display = ("id", "user", "status", "total_price", "created_at")
     list_filter = ("status", "created_at")
     search_fields = ("user__username", "id")
-    readonly_fields = ("created_at",)
-    ordering = ("-created_at",)
\ No newline at end of file
+    # status only moves through the actions below, so every change goes
+    # through Order.objects.transition(): event log, rollups and announcements
+    readonly_fields = ("status", "created_at")
+    ordering = ("-created_at",)
+    inlines = [OrderStatusEventInline]
+    actions = [
+        transition_action("preparing", "Mark selected orders as preparing"),
+        transition_action("delivered", "Mark selected orders as delivered"),
+        transition_action("cancelled", "Cancel selected orders"),
+    ]
+
+
+@admin.register(OrderStatusEvent)
+class OrderStatusEventAdmin(admin.ModelAdmin):
+    list_display = ("id", "order", "from_status", "to_status", "changed_by", "created_at")
+    list_filter = ("to_status", "created_at")
+    search_fields = ("order__id",)
+    readonly_fields = ("order", "from_status", "to_status", "changed_by", "created_at")
+
+
+
+@admin.register(DailyMenuItemSales)
+class DailyMenuItemSalesAdmin(admin.ModelAdmin):
+    list_display = ("day", "menu_item_id", "quantity", "revenue", "order_count", "delivered_count")
+    list_filter = ("day",)
+    ordering = ("-day", "menu_item_id")
+
+
+
+@admin.register(ArchivedOrder)
+class ArchivedOrderAdmin(admin.ModelAdmin):
+    list_display = ("id", "user", "status", "total_price", "created_at", "archived_at")
+    list_filter = ("status",)
+    search_fields = ("user__username", "id")
+    ordering = ("-created_at",)
@@ -0,0 +1,75 @@
+"""
+Move finished orders out of the hot tables.
+
+Delivered and cancelled orders older than a cutoff are copied, with their
+items and status events, into the Archived* tables and deleted from the
+hot ones, one batch per transaction. Each batch is a fixed number of
+statements, and the hot tables (and their indexes) end up holding only
+recent and in-flight orders. Sales rollups are unaffected: they were
+counted when the orders were placed, cancelled or delivered, and
+rollups.rebuild reads the archive tables as well as the hot ones.
+"""
+
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import (
+    ArchivedOrder,
+    ArchivedOrderItem,
+    ArchivedOrderStatusEvent,
+    Order,
+    OrderItem,
+    OrderStatusEvent,
+)
+
+FINAL_STATUSES = ("delivered", "cancelled")
+
+COPIES = (
+    # (hot model, archive model, filter on the order ids, fields)
+    (Order, ArchivedOrder, "id__in",
+     ("id", "user_id", "status", "total_price", "created_at")),
+    (OrderItem, ArchivedOrderItem, "order_id__in",
+     ("id", "order_id", "menu_item_id", "quantity", "price")),
+    (OrderStatusEvent, ArchivedOrderStatusEvent, "order_id__in",
+     ("id", "order_id", "from_status", "to_status", "changed_by_id", "created_at")),
+)
+
+
+def archivable(older_than_days):
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    return Order.objects.filter(status__in=FINAL_STATUSES, created_at__lt=cutoff)
+
+
+@transaction.atomic
+def archive_batch(older_than_days, batch_size):
+    """Archive up to `batch_size` orders; returns how many moved."""
+    ids = list(
+        archivable(older_than_days)
+        .select_for_update()
+        .order_by("id")
+        .values_list("id", flat=True)[:batch_size]
+    )
+    if not ids:
+        return 0
+
+    for hot, cold, lookup, fields in COPIES:
+        rows = hot.objects.filter(**{lookup: ids}).values(*fields)
+        cold.objects.bulk_create([cold(**row) for row in rows], batch_size=batch_size)
+
+    # children first so each DELETE is a plain statement with no cascade
+    OrderStatusEvent.objects.filter(order_id__in=ids).delete()
+    OrderItem.objects.filter(order_id__in=ids).delete()
+    Order.objects.filter(id__in=ids).delete()
+    return len(ids)
+
+
+def archive_orders(older_than_days, batch_size=500):
+    """Archive every eligible order in batches; returns the total moved."""
+    moved = 0
+    while True:
+        count = archive_batch(older_than_days, batch_size)
+        moved += count
+        if count < batch_size:
+            return moved
@@ -0,0 +1,154 @@
+"""
+Order events for the kitchen board (server-sent events).
+
+Writers publish after commit; the SSE view subscribes and relays, so
+kitchen screens get new orders and status changes without anyone polling
+the orders table. With REDIS_URL set, events go over Redis pub/sub and
+reach every process; otherwise they are broadcast in-process, which
+works when the app runs as a single ASGI process (local development).
+
+Brokers' `listen` yields None once subscribed, then messages, with None
+again whenever `timeout` passes quietly. Every message carries `at`, the
+time it was published, so a reader can drop what a snapshot it took after
+subscribing already covers.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Prefetch
+from rest_framework.utils.encoders import JSONEncoder
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "orders:events"
+ACTIVE_STATUSES = ("pending", "preparing")
+
+
+class LocalBroker:
+    """Fan-out to asyncio queues of subscribers living in this process."""
+
+    queue_size = 100
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscribers = set()
+
+    def publish(self, message):
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(self.offer, queue, message)
+
+    @staticmethod
+    def offer(queue, message):
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # a stalled screen drops events rather than growing forever;
+            # it resyncs from the snapshot when it reconnects
+            pass
+
+    async def listen(self, timeout):
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        entry = (asyncio.get_running_loop(), queue)
+        with self.lock:
+            self.subscribers.add(entry)
+        try:
+            yield None
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            with self.lock:
+                self.subscribers.discard(entry)
+
+
+class RedisBroker:
+    def __init__(self, url):
+        import redis
+
+        self.url = url
+        self.client = redis.Redis.from_url(url)
+
+    def publish(self, message):
+        self.client.publish(CHANNEL, message)
+
+    async def listen(self, timeout):
+        from redis import asyncio as aioredis
+
+        client = aioredis.from_url(self.url)
+        pubsub = client.pubsub()
+        await pubsub.subscribe(CHANNEL)
+        try:
+            yield None
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+                yield message["data"].decode() if message else None
+        finally:
+            await pubsub.unsubscribe(CHANNEL)
+            await pubsub.aclose()
+            await client.aclose()
+
+
+_broker = None
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        _broker = RedisBroker(settings.REDIS_URL) if settings.REDIS_URL else LocalBroker()
+    return _broker
+
+
+def encode(event, data, at=None):
+    at = time.time() if at is None else at
+    return json.dumps({"event": event, "at": at, "data": data}, cls=JSONEncoder)
+
+
+def publish(event, data):
+    # runs after commit: a broker outage must not fail the request
+    try:
+        get_broker().publish(encode(event, data))
+    except Exception:
+        logger.exception("Could not publish %s event", event)
+
+
+def active_orders():
+    from .models import Order, OrderItem
+
+    return (
+        Order.objects
+        .filter(status__in=ACTIVE_STATUSES)
+        .prefetch_related(
+            Prefetch("items", queryset=OrderItem.objects.select_related("menu_item__food"))
+        )
+        .order_by("created_at", "id")
+    )
+
+
+def publish_order_created(order_id):
+    from .serializers import OrderSerializer
+
+    order = active_orders().filter(id=order_id).first()
+    if order is not None:
+        publish("order_created", OrderSerializer(order).data)
+
+
+def publish_status_changed(order_ids, status):
+    publish("order_status", {"ids": list(order_ids), "status": status})
+
+
+def order_created(order_id):
+    transaction.on_commit(lambda: publish_order_created(order_id))
+
+
+def status_changed(order_ids, status):
+    transaction.on_commit(lambda: publish_status_changed(order_ids, status))
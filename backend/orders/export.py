@@ -0,0 +1,58 @@
+"""
+Flat order exports: one row per order item, with its order's columns.
+
+Rows come from values_list(...).iterator(), i.e. a server-side cursor on
+PostgreSQL read in chunks, so nothing is materialized and memory stays
+flat however long the date range is.
+"""
+
+from itertools import chain
+
+from .models import ArchivedOrderItem, OrderItem
+
+COLUMNS = (
+    "order_id",
+    "created_at",
+    "user_id",
+    "username",
+    "status",
+    "order_total",
+    "item_id",
+    "menu_item_id",
+    "food_name",
+    "quantity",
+    "price",
+)
+
+FIELDS = (
+    "order_id",
+    "order__created_at",
+    "order__user_id",
+    "order__user__username",
+    "order__status",
+    "order__total_price",
+    "id",
+    "menu_item_id",
+    "menu_item__food__name",
+    "quantity",
+    "price",
+)
+
+
+def export_rows(orders, archived_orders=None, chunk_size=2000):
+    """
+    Rows for `orders` (an Order queryset), followed by those for
+    `archived_orders` when given, each ordered by order time.
+    """
+    sources = [(OrderItem, orders)]
+    if archived_orders is not None:
+        sources.append((ArchivedOrderItem, archived_orders))
+
+    return chain.from_iterable(
+        item_model.objects
+        .filter(order__in=order_queryset.values("id"))
+        .order_by("order__created_at", "order_id", "id")
+        .values_list(*FIELDS)
+        .iterator(chunk_size=chunk_size)
+        for item_model, order_queryset in sources
+    )
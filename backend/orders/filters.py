@@ -0,0 +1,43 @@
+from datetime import datetime, time
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import Order
+
+STATUSES = {value for value, _ in Order.STATUS_CHOICES}
+
+
+def parse_bound(value, end_of_day=False):
+    """A date or datetime query param as an aware datetime."""
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f"invalid date: {value}")
+        moment = datetime.combine(day, time.max if end_of_day else time.min)
+
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def filter_orders(orders, params):
+    """
+    Apply ?status=pending,preparing&from=2025-01-01&to=2025-01-31.
+
+    `to` is inclusive when given as a date. Raises ValueError on bad input.
+    """
+    statuses = [s for s in params.get("status", "").split(",") if s]
+    if statuses:
+        unknown = set(statuses) - STATUSES
+        if unknown:
+            raise ValueError(f"unknown status: {', '.join(sorted(unknown))}")
+        orders = orders.filter(status__in=statuses)
+
+    if params.get("from"):
+        orders = orders.filter(created_at__gte=parse_bound(params["from"]))
+    if params.get("to"):
+        orders = orders.filter(created_at__lte=parse_bound(params["to"], end_of_day=True))
+
+    return orders
@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from orders.archive import archive_orders
+
+
+class Command(BaseCommand):
+    help = "Move delivered and cancelled orders older than --days into the archive tables (run daily)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=settings.ORDER_ARCHIVE_AFTER_DAYS)
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        moved = archive_orders(options["days"], batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Archived {moved} order(s)."))
@@ -0,0 +1,91 @@
+import statistics
+import time
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from cart.models import Cart, CartItem
+from menu import prices
+from menu.models import Food, MenuItems
+from orders.checkout import place_order
+
+User = get_user_model()
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure query count and latency of checkout for carts of various sizes. "
+        "Runs inside a transaction that is rolled back, so no data is kept."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lines", type=int, nargs="+", default=[1, 10, 100])
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'lines':>6} {'queries':>8} {'median ms':>10} {'max ms':>8}")
+
+        try:
+            with transaction.atomic():
+                user, cart, items = self.fixture(max(options["lines"]))
+
+                for size in options["lines"]:
+                    queries, timings = self.measure(user, cart, items[:size], options["repeat"])
+                    self.stdout.write(
+                        f"{size:>6} {queries:>8} "
+                        f"{statistics.median(timings):>10.2f} {max(timings):>8.2f}"
+                    )
+                raise Rollback
+        except Rollback:
+            pass
+        finally:
+            # the price table was rebuilt with the rolled-back fixture
+            prices.mark_stale()
+
+    def fixture(self, count):
+        tag = uuid.uuid4().hex[:8]
+        user = User.objects.create_user(
+            username=f"bench-{tag}",
+            email=f"bench-{tag}@example.com",
+            password=None,
+        )
+        cart, _ = Cart.objects.get_or_create(user=user)
+
+        foods = Food.objects.bulk_create(
+            [Food(name=f"bench-{tag}-{i}") for i in range(count)]
+        )
+        items = MenuItems.objects.bulk_create(
+            [MenuItems(food=food, price=100 + i, available=True) for i, food in enumerate(foods)]
+        )
+        # bulk_create sends no signals
+        prices.mark_stale()
+        return user, cart, items
+
+    def measure(self, user, cart, items, repeat):
+        timings = []
+        queries = 0
+
+        for _ in range(repeat):
+            CartItem.objects.bulk_create(
+                [CartItem(cart=cart, menu_item=item, quantity=2) for item in items]
+            )
+
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                place_order(user)
+                timings.append((time.perf_counter() - started) * 1000)
+
+            # savepoint statements are bookkeeping, not work
+            queries = sum(
+                1 for query in captured.captured_queries
+                if "SAVEPOINT" not in query["sql"]
+            )
+
+        return queries, timings
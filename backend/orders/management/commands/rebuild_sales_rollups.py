@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from orders import rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild the daily sales rollups from orders (backfill, or repair after manual edits)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", help="Only rebuild days from this date (YYYY-MM-DD) onwards.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        since = None
+        if options["since"]:
+            since = parse_date(options["since"])
+            if since is None:
+                raise CommandError(f"Invalid date: {options['since']}")
+
+        written = rollups.rebuild(since=since, batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} daily sales row(s)."))
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.14 on 2026-10-18 13:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('menu', '0004_food_updated_at_menuitems_updated_at'),
+        ('orders', '0004_order_status_events'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyMenuItemSales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('quantity', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('order_count', models.IntegerField(default=0)),
+                ('delivered_quantity', models.IntegerField(default=0)),
+                ('delivered_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('delivered_count', models.IntegerField(default=0)),
+                ('menu_item', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='menu.menuitems')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='dailymenuitemsales',
+            constraint=models.UniqueConstraint(fields=('day', 'menu_item'), name='sales_day_menu_item_uniq'),
+        ),
+    ]
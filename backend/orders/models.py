@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from menu.models import MenuItems
 
@@ -7,6 +7,71 @@ from menu.models import MenuItems
 # Create your models here.
 
 
+# to_status -> statuses an order may move from
+TRANSITIONS = {
+    'preparing': ('pending',),
+    'delivered': ('preparing',),
+    'cancelled': ('pending', 'preparing'),
+}
+
+
+class InvalidTransition(ValueError):
+    pass
+
+
+class OrderQuerySet(models.QuerySet):
+    def transition(self, to_status, changed_by=None, only_from=None):
+        """
+        Move every order in this queryset that is allowed to reach
+        `to_status`, and return the ids that moved.
+
+        The matching rows are locked and read once (id and current status,
+        for the event log), then moved by one conditional
+        UPDATE ... WHERE status IN (...) and logged by one bulk INSERT, so
+        the cost is the same for one order or fifty. Orders in any other
+        status are left alone, and the row lock means a concurrent
+        transition of the same order waits and then skips it instead of
+        overwriting it.
+        """
+        if to_status not in TRANSITIONS:
+            raise InvalidTransition(f"Unknown status '{to_status}'")
+
+        allowed = TRANSITIONS[to_status]
+        if only_from is not None:
+            allowed = tuple(s for s in allowed if s in only_from)
+
+        with transaction.atomic():
+            moving = list(
+                self.filter(status__in=allowed)
+                .select_for_update()
+                .order_by('id')
+                .values_list('id', 'status')
+            )
+            if not moving:
+                return []
+
+            ids = [order_id for order_id, _ in moving]
+            Order.objects.filter(id__in=ids, status__in=allowed).update(status=to_status)
+            OrderStatusEvent.objects.bulk_create([
+                OrderStatusEvent(
+                    order_id=order_id,
+                    from_status=from_status,
+                    to_status=to_status,
+                    changed_by=changed_by,
+                )
+                for order_id, from_status in moving
+            ])
+
+            from . import rollups
+            rollups.record_transition(ids, to_status)
+
+            # update() sends no post_save, so announce the change here
+            from . import events
+            events.status_changed(ids, to_status)
+
+        return ids
+
+
 class Order(models.Model):
     STATUS_CHOICES = (
         ('pending', 'Pending'),
@@ -36,9 +101,58 @@ class Order(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = OrderQuerySet.as_manager()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # compared on save so only real status changes are announced
+        if "status" in field_names:
+            instance._loaded_status = values[field_names.index("status")]
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        if fields is None or "status" in fields:
+            self._loaded_status = self.status
+
+    class Meta:
+        indexes = [
+            # order history: a user's orders newest first, keyset paginated
+            models.Index(fields=["user", "-created_at", "-id"], name="order_user_history_idx"),
+            # kitchen board: active orders oldest first
+            models.Index(fields=["status", "created_at"], name="order_status_idx"),
+        ]
+
     def __str__(self):
         return f"Order #{self.id} - {self.user.username}"
 
+
+class OrderStatusEvent(models.Model):
+    """Append-only log of status transitions."""
+
+    order = models.ForeignKey(
+        Order,
+        on_delete=models.CASCADE,
+        related_name='status_events',
+    )
+    from_status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES)
+    to_status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES)
+    changed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['created_at', 'id']
+
+    def __str__(self):
+        return f"Order #{self.order_id}: {self.from_status} -> {self.to_status}"
+
 class OrderItem(models.Model):
     order =  models.ForeignKey(
         Order,
@@ -60,4 +174,98 @@ class OrderItem(models.Model):
     )
 
     def __str__(self):
-        return f"{self.menu_item.food.name} x {self.quantity}"
\ No newline at end of file
+        return f"{self.menu_item.food.name} x {self.quantity}"
+
+class DailyMenuItemSales(models.Model):
+    """
+    Per menu item per day sales, kept up to date by orders.rollups.
+
+    quantity, revenue and order_count cover every order placed that day
+    that has not been cancelled; the delivered_* columns cover the subset
+    that has been delivered. Days are local (TIME_ZONE) dates of
+    Order.created_at. The menu item has no database constraint so history
+    survives a menu item being deleted.
+    """
+
+    day = models.DateField()
+    menu_item = models.ForeignKey(
+        MenuItems,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='+',
+    )
+    quantity = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    order_count = models.IntegerField(default=0)
+    delivered_quantity = models.IntegerField(default=0)
+    delivered_revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    delivered_count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'menu_item'], name='sales_day_menu_item_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} item #{self.menu_item_id}: {self.quantity} sold"
+
+
+# Cold storage: delivered and cancelled orders moved out of the hot tables
+# by orders.archive. Rows keep their original ids.
+
+
+class ArchivedOrder(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='archived_orders',
+    )
+    status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES)
+    total_price = models.DecimalField(max_digits=10, decimal_places=2)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "-created_at", "-id"], name="archived_order_history_idx"),
+        ]
+
+    def __str__(self):
+        return f"Archived order #{self.id}"
+
+
+class ArchivedOrderItem(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    order = models.ForeignKey(
+        ArchivedOrder,
+        on_delete=models.CASCADE,
+        related_name='items',
+    )
+    menu_item = models.ForeignKey(
+        MenuItems,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='+',
+    )
+    quantity = models.PositiveIntegerField()
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+
+
+class ArchivedOrderStatusEvent(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    order = models.ForeignKey(
+        ArchivedOrder,
+        on_delete=models.CASCADE,
+        related_name='status_events',
+    )
+    from_status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES)
+    to_status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES)
+    changed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+    )
+    created_at = models.DateTimeField()
@@ -0,0 +1,26 @@
+from backend.pagination import KeysetPagination
+
+
+class OrderHistoryPagination(KeysetPagination):
+    """
+    Keyset pages over a user's orders, optionally read through to the
+    archive: pass `archive` (an ArchivedOrder queryset) and each page is
+    the merge of both tables' windows. Archived orders keep their ids, so
+    (created_at, id) cursors mean the same thing in both.
+    """
+
+    page_size = 20
+    max_page_size = 100
+
+    def __init__(self, archive=None):
+        self.archive = archive
+
+    def fetch(self, queryset, cursor):
+        rows = super().fetch(queryset, cursor)
+        if self.archive is None:
+            return rows
+
+        rows += super().fetch(self.archive, cursor)
+        reverse = cursor is not None and cursor[2]
+        rows.sort(key=lambda row: (getattr(row, self.ordering_field), row.id), reverse=not reverse)
+        return rows[: self.limit + 1]
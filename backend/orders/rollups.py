@@ -0,0 +1,150 @@
+"""
+Daily sales rollups (DailyMenuItemSales).
+
+Every change is folded into per (day, menu item) deltas in Python and
+written with one upsert statement that adds to the existing counters, so
+placing, cancelling or delivering an order costs one write however many
+lines it has, and reports never scan OrderItem. `rebuild` recomputes the
+table in bulk from the hot and archived order tables, for backfills or
+after manual edits.
+"""
+
+import itertools
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import ArchivedOrderItem, DailyMenuItemSales, OrderItem
+
+LIVE = ("quantity", "revenue", "order_count")
+DELIVERED = ("delivered_quantity", "delivered_revenue", "delivered_count")
+COUNTERS = LIVE + DELIVERED
+MONEY = ("revenue", "delivered_revenue")
+
+
+def fold(rows, columns, sign=1):
+    """
+    rows: (order_id, created_at, menu_item_id, quantity, price), sorted by
+    order_id. Returns {(day, menu_item_id): {column: delta}} for the three
+    `columns` (quantity, revenue and order count, in that order).
+    """
+    quantity_col, revenue_col, count_col = columns
+    deltas = {}
+    last_order = {}
+
+    for order_id, created_at, menu_item_id, quantity, price in rows:
+        if menu_item_id is None:
+            continue
+        key = (timezone.localdate(created_at), menu_item_id)
+        delta = deltas.setdefault(key, {quantity_col: 0, revenue_col: Decimal("0"), count_col: 0})
+        delta[quantity_col] += sign * quantity
+        delta[revenue_col] += sign * quantity * price
+        if last_order.get(key) != order_id:
+            last_order[key] = order_id
+            delta[count_col] += sign
+
+    return deltas
+
+
+def upsert_sql(rows):
+    table = connection.ops.quote_name(DailyMenuItemSales._meta.db_table)
+    columns = ("day", "menu_item_id") + COUNTERS
+    placeholders = ", ".join(["(" + ", ".join(["%s"] * len(columns)) + ")"] * rows)
+
+    if connection.vendor == "mysql":
+        updates = ", ".join(f"{col} = {col} + VALUES({col})" for col in COUNTERS)
+        conflict = f"ON DUPLICATE KEY UPDATE {updates}"
+    else:
+        # postgresql and sqlite
+        updates = ", ".join(f"{col} = {table}.{col} + excluded.{col}" for col in COUNTERS)
+        conflict = f"ON CONFLICT (day, menu_item_id) DO UPDATE SET {updates}"
+
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES {placeholders} {conflict}"
+
+
+def apply(deltas):
+    """Add `deltas` (from fold) to the rollup table in one statement."""
+    if not deltas:
+        return
+
+    params = []
+    for (day, menu_item_id), delta in deltas.items():
+        params += [day, menu_item_id]
+        params += [delta.get(col, 0) for col in COUNTERS]
+
+    with connection.cursor() as cursor:
+        cursor.execute(upsert_sql(len(deltas)), params)
+
+
+def record_placed(order, items):
+    """Count a just-created order; `items` are its OrderItem instances."""
+    apply(fold(
+        ((order.id, order.created_at, item.menu_item_id, item.quantity, item.price) for item in items),
+        LIVE,
+    ))
+
+
+def record_transition(order_ids, to_status):
+    """Adjust the rollups for orders that just moved to `to_status`."""
+    if to_status == "cancelled":
+        columns, sign = LIVE, -1
+    elif to_status == "delivered":
+        columns, sign = DELIVERED, 1
+    else:
+        return
+
+    rows = (
+        OrderItem.objects
+        .filter(order_id__in=order_ids)
+        .order_by("order_id")
+        .values_list("order_id", "order__created_at", "menu_item_id", "quantity", "price")
+    )
+    apply(fold(rows, columns, sign))
+
+
+@transaction.atomic
+def rebuild(since=None, batch_size=1000):
+    """
+    Recompute rollups from orders, hot and archived, for every day or from
+    `since` (a date) onwards. Returns the number of rollup rows written.
+    """
+    existing = DailyMenuItemSales.objects.all()
+    sources = [
+        OrderItem.objects.exclude(menu_item=None).exclude(order__status="cancelled"),
+        ArchivedOrderItem.objects.exclude(menu_item=None).exclude(order__status="cancelled"),
+    ]
+    if since is not None:
+        existing = existing.filter(day__gte=since)
+        sources = [items.filter(order__created_at__date__gte=since) for items in sources]
+
+    existing.delete()
+
+    totals = {}
+    last_order = {}
+    # archiving keeps order ids, so an id is in exactly one of the sources
+    rows = itertools.chain.from_iterable(
+        items
+        .order_by("order_id")
+        .values_list("order_id", "order__created_at", "order__status", "menu_item_id", "quantity", "price")
+        .iterator(chunk_size=batch_size)
+        for items in sources
+    )
+    for order_id, created_at, order_status, menu_item_id, quantity, price in rows:
+        key = (timezone.localdate(created_at), menu_item_id)
+        row = totals.get(key)
+        if row is None:
+            row = totals[key] = DailyMenuItemSales(day=key[0], menu_item_id=menu_item_id)
+        new_order = last_order.get(key) != order_id
+        last_order[key] = order_id
+
+        row.quantity += quantity
+        row.revenue += quantity * price
+        row.order_count += new_order
+        if order_status == "delivered":
+            row.delivered_quantity += quantity
+            row.delivered_revenue += quantity * price
+            row.delivered_count += new_order
+
+    DailyMenuItemSales.objects.bulk_create(totals.values(), batch_size=batch_size)
+    return len(totals)
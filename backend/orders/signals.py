@@ -0,0 +1,20 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from .models import Order
+from . import events
+
+
+@receiver(post_save, sender=Order)
+def announce_order(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        events.order_created(instance.id)
+        instance._loaded_status = instance.status
+        return
+
+    if update_fields is not None and "status" not in update_fields:
+        return
+    # unknown for instances not loaded from the database: announce
+    previous = getattr(instance, "_loaded_status", None)
+    if previous != instance.status:
+        events.status_changed([instance.id], instance.status)
+        instance._loaded_status = instance.status
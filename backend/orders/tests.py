@@ -1,3 +1,299 @@
-from django.test import TestCase
+import json
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from cart.models import Cart, CartItem
+from menu import prices
+from menu.models import Food, MenuItems
+from . import events, rollups
+from .archive import archive_orders
+from .checkout import place_order
+from .models import ArchivedOrder, DailyMenuItemSales, Order
+from .serializers import OrderSerializer
+from .views import kitchen_stream
+
+User = get_user_model()
+
+
+def make_menu(count):
+    foods = Food.objects.bulk_create([Food(name=f"dish {i}", approved=True) for i in range(count)])
+    items = MenuItems.objects.bulk_create(
+        [MenuItems(food=food, price=100 + i, available=True) for i, food in enumerate(foods)]
+    )
+    # bulk_create sends no signals
+    prices.mark_stale()
+    return items
+
+
+def fill_cart(user, items, quantity=1):
+    cart, _ = Cart.objects.get_or_create(user=user)
+    CartItem.objects.bulk_create([CartItem(cart=cart, menu_item=item, quantity=quantity) for item in items])
+
+
+def streamed(response):
+    """Body of a streaming response, read the way the ASGI handler does."""
+    assert response.is_async, "sync streaming bodies are buffered whole under ASGI"
+
+    async def collect():
+        return b"".join([chunk async for chunk in response.streaming_content])
+
+    return async_to_sync(collect)()
+
+
+def rollup_rows():
+    return list(
+        DailyMenuItemSales.objects
+        .order_by("day", "menu_item_id")
+        .values_list("day", "menu_item_id", "quantity", "revenue", "order_count", "delivered_quantity")
+    )
+
+
+class RollupRebuildTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="diner", email="diner@example.com", password="x")
+        self.items = make_menu(2)
+
+    def test_rebuild_after_archiving_keeps_archived_days(self):
+        fill_cart(self.user, self.items, quantity=2)
+        order = place_order(self.user)
+        Order.objects.filter(id=order.id).transition("preparing")
+        Order.objects.filter(id=order.id).transition("delivered")
+        Order.objects.filter(id=order.id).update(created_at=timezone.now() - timedelta(days=120))
+
+        rollups.rebuild()
+        before = rollup_rows()
+        self.assertEqual(len(before), 2)
+        self.assertEqual(before[0][2:], (2, Decimal("200.00"), 1, 2))
+
+        self.assertEqual(archive_orders(older_than_days=90), 1)
+        self.assertTrue(ArchivedOrder.objects.filter(id=order.id).exists())
+
+        rollups.rebuild()
+        self.assertEqual(rollup_rows(), before)
+
+
+class OrderExportTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="diner", email="diner@example.com", password="x")
+        self.staff = User.objects.create_user(username="staff", email="staff@example.com", password="x", is_staff=True)
+        self.items = make_menu(1)
+        fill_cart(self.user, self.items, quantity=3)
+        self.order = place_order(self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.staff)
+
+    def test_ndjson_keeps_decimals_exact_and_times_local(self):
+        response = self.client.get("/api/orders/admin/export/?output=ndjson")
+        self.assertEqual(response.status_code, 200)
+        rows = [json.loads(line) for line in streamed(response).decode().splitlines()]
+
+        api = OrderSerializer(Order.objects.get(id=self.order.id)).data
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["order_total"], "300.00")
+        self.assertEqual(rows[0]["price"], "100.00")
+        self.assertEqual(rows[0]["created_at"], api["created_at"])
+
+
+class OrderEventTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="diner", email="diner@example.com", password="x")
+        fill_cart(self.user, make_menu(1))
+        self.order_id = place_order(self.user).id
+
+    def published(self, change):
+        with mock.patch.object(events, "publish") as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                change(Order.objects.get(id=self.order_id))
+        return [call.args[0] for call in publish.call_args_list]
+
+    def test_saves_without_a_status_change_are_not_announced(self):
+        def edit_total(order):
+            order.total_price = Decimal("1.00")
+            order.save()
+
+        self.assertEqual(self.published(edit_total), [])
+
+    def test_transition_is_announced_once(self):
+        def advance(order):
+            Order.objects.filter(id=order.id).transition("preparing")
+            order.refresh_from_db()
+            order.save()
+
+        self.assertEqual(self.published(advance), ["order_status"])
+
+
+class OrderAdminTests(TestCase):
+    changelist = "/admin/orders/order/"
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username="manager", email="manager@example.com", password="x")
+        self.user = User.objects.create_user(username="diner", email="diner@example.com", password="x")
+        self.items = make_menu(1)
+        fill_cart(self.user, self.items, quantity=2)
+        self.order = place_order(self.user)
+        self.client.force_login(self.admin)
+
+    def act(self, action, *orders):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(
+                self.changelist, {"action": action, "_selected_action": [order.id for order in orders]}
+            )
+
+    def test_status_is_not_editable(self):
+        page = self.client.get(f"{self.changelist}{self.order.id}/change/")
+        self.assertNotContains(page, 'name="status"')
+
+    def test_actions_go_through_the_state_machine(self):
+        self.act("mark_preparing", self.order)
+        self.act("mark_delivered", self.order)
+        self.act("mark_preparing", self.order)  # not allowed from delivered: skipped
+
+        self.assertEqual(Order.objects.get(id=self.order.id).status, "delivered")
+        events = list(self.order.status_events.order_by("id").values_list("from_status", "to_status", "changed_by"))
+        self.assertEqual(events, [("pending", "preparing", self.admin.id), ("preparing", "delivered", self.admin.id)])
+
+        delivered = DailyMenuItemSales.objects.values_list("delivered_quantity", "delivered_revenue")
+        self.assertEqual(list(delivered), [(2, Decimal("200.00"))])
+
+
+class SalesReportTests(TestCase):
+    def setUp(self):
+        self.staff = User.objects.create_user(username="staff", email="staff@example.com", password="x", is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.staff)
+
+    def test_money_is_reported_as_strings(self):
+        user = User.objects.create_user(username="diner", email="diner@example.com", password="x")
+        fill_cart(user, make_menu(1), quantity=3)
+        place_order(user)
+
+        report = self.client.get("/api/orders/admin/sales/?group=item").json()
+        self.assertEqual(report["results"][0]["revenue"], "300.00")
+        self.assertEqual(report["results"][0]["delivered_revenue"], "0.00")
+        self.assertEqual(report["totals"]["revenue"], "300.00")
+        self.assertEqual(report["totals"]["quantity"], 3)
+
+    def test_empty_report_totals_are_zero_money(self):
+        report = self.client.get("/api/orders/admin/sales/").json()
+        self.assertEqual(report["results"], [])
+        self.assertEqual(report["totals"]["revenue"], "0.00")
+
+
+class KitchenStreamTests(TestCase):
+    def setUp(self):
+        self.staff = User.objects.create_user(username="staff", email="staff@example.com", password="x", is_staff=True)
+        self.user = User.objects.create_user(username="diner", email="diner@example.com", password="x")
+        fill_cart(self.user, make_menu(1))
+        self.order = place_order(self.user)
+
+    def read(self, count):
+        request = RequestFactory().get("/api/orders/kitchen/stream/")
+        request.COOKIES["access_token"] = str(AccessToken.for_user(self.staff))
+
+        async def collect():
+            response = await kitchen_stream(request)
+            chunks = []
+            async for chunk in response.streaming_content:
+                chunks.append(chunk.decode() if isinstance(chunk, bytes) else chunk)
+                if len(chunks) == count:
+                    break
+            await response.streaming_content.aclose()
+            return chunks
+
+        return async_to_sync(collect)()
+
+    def test_events_during_the_snapshot_are_kept_and_older_ones_dropped(self):
+        snapshot = events.active_orders
+
+        def racing_snapshot():
+            # published before the snapshot was taken, and while it runs
+            events.get_broker().publish(events.encode("order_status", {"ids": [0], "status": "stale"}, at=0))
+            events.publish_status_changed([self.order.id], "preparing")
+            return snapshot()
+
+        broker = events.LocalBroker()
+        with mock.patch.object(events, "get_broker", return_value=broker):
+            with mock.patch.object(events, "active_orders", racing_snapshot):
+                _, first, second = self.read(3)
+
+        self.assertTrue(first.startswith("event: snapshot\n"))
+        self.assertIn(f'"id": {self.order.id}', first)
+        self.assertTrue(second.startswith("event: order_status\n"))
+        self.assertIn('"status": "preparing"', second)
+        self.assertEqual(broker.subscribers, set())
+
+
+class CheckoutQueryTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="diner", email="diner@example.com", password="x")
+        self.items = make_menu(100)
+        prices.price_table()  # warm, as in steady state
+
+    def test_checkout_runs_six_statements_for_any_cart_size(self):
+        for size in (1, 10, 100):
+            with self.subTest(lines=size):
+                fill_cart(self.user, self.items[:size], quantity=2)
+
+                # six statements, plus the SAVEPOINT / RELEASE SAVEPOINT pair
+                # place_order's atomic() opens inside the test transaction
+                with self.assertNumQueries(6 + 2):
+                    order = place_order(self.user)
+
+                self.assertEqual(order.items.count(), size)
+                self.assertFalse(CartItem.objects.filter(cart__user=self.user).exists())
+
+
+class OrderHistoryCursorTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="diner", email="diner@example.com", password="x")
+        stranger = User.objects.create_user(username="stranger", email="stranger@example.com", password="x")
+        Order.objects.create(user=stranger, total_price=1)
+
+        now = timezone.now()
+        statuses = ["delivered", "cancelled", "delivered", "pending", "delivered", "preparing", "pending"]
+        self.orders = []
+        for i, order_status in enumerate(statuses):
+            order = Order.objects.create(user=self.user, status=order_status, total_price=10 + i)
+            # oldest first, two orders per timestamp so pages break ties on id
+            days_ago = 200 - 50 * (i // 2)
+            Order.objects.filter(id=order.id).update(created_at=now - timedelta(days=days_ago))
+            self.orders.append(order)
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def newest_first(self, orders):
+        return [order.id for order in sorted(orders, key=lambda order: order.id, reverse=True)]
+
+    def walk(self, url):
+        seen = []
+        while url:
+            page = self.client.get(url).json()
+            seen += [order["id"] for order in page["results"]]
+            url = page["next"]
+        return seen
+
+    def test_next_links_cover_the_history_once_in_order(self):
+        self.assertEqual(self.walk("/api/orders/my/?page_size=2"), self.newest_first(self.orders))
+
+    def test_filters_apply_across_pages(self):
+        delivered = [order for order in self.orders if order.status == "delivered"]
+        self.assertEqual(self.walk("/api/orders/my/?page_size=1&status=delivered"), self.newest_first(delivered))
+
+        response = self.client.get("/api/orders/my/?status=lost")
+        self.assertEqual(response.status_code, 400)
+
+    def test_archived_orders_merge_into_the_same_cursor_walk(self):
+        self.assertEqual(archive_orders(older_than_days=90), 4)
+
+        hot = [order for order in self.orders if Order.objects.filter(id=order.id).exists()]
+        self.assertEqual(self.walk("/api/orders/my/?page_size=2"), self.newest_first(hot))
+        self.assertEqual(self.walk("/api/orders/my/?page_size=2&archived=1"), self.newest_first(self.orders))
@@ -7,4 +7,9 @@ urlpatterns = [
     path('my/', MyOrderView.as_view()),
     path('<int:pk>/cancel/', CancelOrderView.as_view()),
     path('admin/all/', AllOrdersView.as_view()),
+    path('admin/status/', BulkOrderStatusView.as_view()),
+    path('admin/sales/', SalesReportView.as_view()),
+    path('admin/export/', OrderExportView.as_view()),
+    path('kitchen/', KitchenOrdersView.as_view()),
+    path('kitchen/stream/', kitchen_stream),
 ]
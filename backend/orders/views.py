@@ -1,14 +1,33 @@
+import json
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from asgiref.sync import sync_to_async
 from django.shortcuts import render
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import permissions, status
+from rest_framework.exceptions import AuthenticationFailed
 from django.db import transaction
+from django.db.models import Prefetch, Sum
 
 from .models import *
-from cart.models import Cart
+from . import events, export, rollups
+from .checkout import place_order, EmptyCartError, UnavailableItemsError
+from .filters import filter_orders
+from .pagination import OrderHistoryPagination
+from accounts.authentication import CookieJWTAuthentication
+from cart.store import get_store
+from menu.models import MenuItems
 
 from rest_framework import generics
 from .serializers import OrderSerializer
+from backend.streaming import wants_stream, stream_json_array, stream_csv, stream_ndjson
+from idempotency.decorators import idempotent
 
 
 # Create your views here.
@@ -16,38 +35,27 @@ from .serializers import OrderSerializer
 class PlaceOrderView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
-    @transaction.atomic
+    @idempotent
     def post(self,request):
-        cart = request.user.cart
-
-        if not cart.items.exists():
+        # checkout reads cart_cartitem: a cached cart is persisted first and
+        # stays locked until the order is placed
+        try:
+            with get_store().checking_out(request.user):
+                order = place_order(request.user)
+        except EmptyCartError:
             return Response(
                 {'error':"cart is empty"},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        order = Order.objects.create(user = request.user)
-        total = 0
-
-        for item  in cart.items.all():
-            
-            OrderItem.objects.create(
-                order = order,
-                menu_item = item.menu_item,
-                quantity = item.quantity,
-                price = item.menu_item.price,
+        except UnavailableItemsError as e:
+            return Response(
+                {'error': "Some items are no longer available", 'menu_items': e.menu_item_ids},
+                status=status.HTTP_400_BAD_REQUEST
             )
 
-            total += item.menu_item.price * item.quantity
-
-
-        order.total_price = total
-        order.save()
-
-        cart.items.all().delete()
-
         return Response(
 
-            {"message":"Order Placed"},
+            {"message":"Order Placed", "order_id": order.id},
             status=status.HTTP_201_CREATED
         )
 
@@ -56,9 +64,42 @@ class MyOrderView(APIView):
     serializer_class = OrderSerializer
 
     def get(self, request):
-        orders = Order.objects.filter(user = request.user)
-        serializer = self.serializer_class(orders, many=True)
-        return Response(serializer.data)
+        try:
+            orders = filter_orders(
+                Order.objects.filter(user = request.user),
+                request.query_params,
+            )
+        except ValueError as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        orders = orders.prefetch_related(
+            Prefetch("items", queryset=OrderItem.objects.select_related("menu_item__food"))
+        )
+
+        # ?archived=1 reads paged history through to orders moved out by
+        # archive_orders (streamed exports stay on the hot table)
+        archive = None
+        if request.query_params.get("archived") in ("1", "true"):
+            archive = filter_orders(
+                ArchivedOrder.objects.filter(user=request.user),
+                request.query_params,
+            ).prefetch_related(
+                Prefetch("items", queryset=ArchivedOrderItem.objects.select_related("menu_item__food"))
+            )
+
+        if wants_stream(request):
+            return stream_json_array(
+                orders.order_by("-created_at", "-id"),
+                self.serializer_class,
+            )
+
+        paginator = OrderHistoryPagination(archive=archive)
+        page = paginator.paginate_queryset(orders, request, view=self)
+        serializer = self.serializer_class(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
 class AllOrdersView(APIView):
     permission_classes = [permissions.IsAdminUser]
@@ -66,29 +107,263 @@ class AllOrdersView(APIView):
 
     queryset = Order.objects.all()
 
-class CancelOrderView(APIView):
-    permission_classes = [permissions.IsAuthenticated]
+    def get(self, request):
+        # every order ever placed: always streamed
+        orders = (
+            self.queryset
+            .prefetch_related("items__menu_item__food")
+            .order_by("-created_at")
+        )
+        return stream_json_array(orders, self.serializer_class)
+
+class SalesReportView(APIView):
+    """
+    GET /api/orders/admin/sales/?from=2025-01-01&to=2025-01-31&menu_item=3&group=item
+
+    Reads only the daily rollups. Without `group` there is one row per
+    menu item per day; group=day sums over items, group=item over days.
+    Defaults to the last 30 days.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+    default_days = 30
+    max_days = 366
+
+    def get(self, request):
+        params = request.query_params
+        today = timezone.localdate()
 
-    def post(self,request,pk):
         try:
-            order = Order.objects.get(pk=pk,user = self.request.user)
-        except Order.DoesNotExist:
+            end = self.parse_day(params.get("to"), today)
+            start = self.parse_day(params.get("from"), end - timedelta(days=self.default_days - 1))
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if start > end:
+            return Response({'error': 'from must not be after to'}, status=status.HTTP_400_BAD_REQUEST)
+        if (end - start).days >= self.max_days:
             return Response(
-                {'error':'Order does not exist'},
+                {'error': f'At most {self.max_days} days per report'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        group = params.get("group")
+        if group not in (None, "day", "item"):
+            return Response({'error': 'group must be day or item'}, status=status.HTTP_400_BAD_REQUEST)
+
+        sales = DailyMenuItemSales.objects.filter(day__gte=start, day__lte=end)
+        if params.get("menu_item"):
+            try:
+                sales = sales.filter(menu_item_id=int(params["menu_item"]))
+            except ValueError:
+                return Response({'error': 'menu_item must be an id'}, status=status.HTTP_400_BAD_REQUEST)
+
+        counters = {name: Sum(name) for name in rollups.COUNTERS}
+        keys = {None: ("day", "menu_item_id"), "day": ("day",), "item": ("menu_item_id",)}[group]
+        rows = list(sales.values(*keys).annotate(**counters).order_by(*keys))
+
+        if "menu_item_id" in keys:
+            names = dict(
+                MenuItems.objects
+                .filter(id__in={row["menu_item_id"] for row in rows})
+                .values_list("id", "food__name")
+            )
+            for row in rows:
+                row["menu_item"] = row.pop("menu_item_id")
+                row["food_name"] = names.get(row["menu_item"])
+
+        totals = {
+            name: sum((row[name] or 0 for row in rows), 0)
+            for name in rollups.COUNTERS
+        }
+        # money goes out as fixed-point strings, like the order serializers
+        for row in rows + [totals]:
+            for name in rollups.MONEY:
+                row[name] = f"{Decimal(row[name] or 0):.2f}"
+
+        return Response({
+            "from": start,
+            "to": end,
+            "totals": totals,
+            "results": rows,
+        })
+
+    @staticmethod
+    def parse_day(value, default):
+        if not value:
+            return default
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f"invalid date: {value}")
+        return day
+
+
+class OrderExportView(APIView):
+    """
+    GET /api/orders/admin/export/?output=csv&from=2025-01-01&to=2025-12-31
+
+    One row per order item, streamed as CSV (default) or NDJSON
+    (output=ndjson). Accepts the same status/from/to filters as order
+    history; archived=1 appends orders from the archive tables.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+    outputs = {"csv": stream_csv, "ndjson": stream_ndjson}
+
+    def get(self, request):
+        output = request.query_params.get("output", "csv")
+        if output not in self.outputs:
+            return Response(
+                {'error': 'output must be csv or ndjson'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        if order.status != 'pending':
+        try:
+            orders = filter_orders(Order.objects.all(), request.query_params)
+            archived = None
+            if request.query_params.get("archived") in ("1", "true"):
+                archived = filter_orders(ArchivedOrder.objects.all(), request.query_params)
+        except ValueError as e:
             return Response(
-                {'error':'Order cannot be canceled'},
+                {'error': str(e)},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        order.status = 'cancelled'
-        order.save()
+        filename = f"orders-{timezone.localdate():%Y%m%d}.{output}"
+        return self.outputs[output](export.COLUMNS, export.export_rows(orders, archived), filename)
+
+
+class KitchenOrdersView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+    serializer_class = OrderSerializer
+
+    def get(self, request):
+        serializer = self.serializer_class(events.active_orders(), many=True)
+        return Response(serializer.data)
+
+
+async def kitchen_stream(request):
+    """
+    Server-sent events for kitchen screens (staff only).
+
+    Sends a `snapshot` of active orders on connect, then `order_created`
+    and `order_status` events as they are published. Needs the ASGI
+    entry point (backend.asgi); keepalive comments every 15s hold the
+    connection open through proxies.
+    """
+    user = await sync_to_async(authenticate_cookie)(request)
+    if user is None or not user.is_staff:
+        return JsonResponse({"detail": "Staff only."}, status=status.HTTP_403_FORBIDDEN)
+
+    # subscribe before reading the snapshot, so nothing published in
+    # between is missed; events from before the snapshot are dropped below
+    messages = events.get_broker().listen(timeout=15)
+    await anext(messages)
+    try:
+        taken_at = time.time()
+        snapshot = await sync_to_async(
+            lambda: events.encode("snapshot", OrderSerializer(events.active_orders(), many=True).data, at=taken_at)
+        )()
+    except BaseException:
+        await messages.aclose()
+        raise
+
+    async def stream():
+        yield "retry: 3000\n\n"
+        yield sse_message(snapshot)
+        async for message in messages:
+            if message is None:
+                yield ": keepalive\n\n"
+            elif json.loads(message)["at"] > taken_at:
+                yield sse_message(message)
+
+    response = StreamingHttpResponse(stream(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+def sse_message(message):
+    event = json.loads(message)["event"]
+    return f"event: {event}\ndata: {message}\n\n"
+
+
+def authenticate_cookie(request):
+    try:
+        result = CookieJWTAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return None
+    return result[0] if result else None
+
+
+class CancelOrderView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self,request,pk):
+        # customers may only cancel before the kitchen starts on it; the
+        # check and the write are one conditional UPDATE, so a concurrent
+        # move to 'preparing' cannot be overwritten
+        moved = (
+            Order.objects
+            .filter(pk=pk, user=request.user)
+            .transition('cancelled', changed_by=request.user, only_from=('pending',))
+        )
+        if moved:
+            return Response(
+                {"message":"Order canceled"},
+                status=status.HTTP_202_ACCEPTED
+            )
+
+        if not Order.objects.filter(pk=pk, user=request.user).exists():
+            return Response(
+                {'error':'Order does not exist'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
         return Response(
-            {"message":"Order canceled"},
-            status=status.HTTP_202_ACCEPTED
+            {'error':'Order cannot be canceled'},
+            status=status.HTTP_400_BAD_REQUEST
         )
 
+
+class BulkOrderStatusView(APIView):
+    """
+    POST /api/orders/admin/status/ {"ids": [1, 2, 3], "status": "preparing"}
+
+    Moves every listed order that may reach the status; the rest are
+    reported back as skipped.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+    max_ids = 500
+
+    def post(self, request):
+        ids = request.data.get('ids')
+        to_status = request.data.get('status')
+
+        if (
+            not isinstance(ids, list)
+            or not ids
+            or not all(isinstance(i, int) and not isinstance(i, bool) for i in ids)
+        ):
+            return Response(
+                {'error': 'ids must be a non-empty list of order ids'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(ids) > self.max_ids:
+            return Response(
+                {'error': f'At most {self.max_ids} orders per request'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            moved = Order.objects.filter(id__in=ids).transition(to_status, changed_by=request.user)
+        except InvalidTransition as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        moved_set = set(moved)
+        return Response({
+            'status': to_status,
+            'updated': moved,
+            'skipped': sorted(set(ids) - moved_set),
+        })
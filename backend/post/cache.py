@@ -0,0 +1,33 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+
+from backend.versioning import VersionedKey
+
+
+FEED_VERSION = VersionedKey("post:feed")
+
+get_feed_version = FEED_VERSION.current
+# bumped whenever a post shown in the feed changes (post.signals)
+bump_feed_version = FEED_VERSION.bump
+
+
+def feed_page_key(request):
+    # absolute uri: cursor/page_size plus host, since next/previous
+    # links and image urls are absolute
+    uri = request.build_absolute_uri()
+    digest = hashlib.md5(uri.encode()).hexdigest()
+    return FEED_VERSION.key(digest)
+
+
+def get_cached_feed_page(request, build):
+    """Return the shared (viewer-neutral) feed page body, building it on a miss."""
+    key = feed_page_key(request)
+    body = cache.get(key)
+
+    if body is None:
+        body = build()
+        cache.set(key, body, settings.POST_FEED_CACHE_TIMEOUT)
+
+    return body
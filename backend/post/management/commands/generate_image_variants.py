@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+
+from backend.images import generate_variants, needs_variants
+from post.cache import bump_feed_version
+from post.models import Post
+from profiles.models import Profile
+
+
+TARGETS = {
+    "post": (Post, "image", "image_variants"),
+    "profile": (Profile, "profile_picture", "picture_variants"),
+}
+
+
+class Command(BaseCommand):
+    help = "Render missing or stale image variants for post images and profile pictures."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--only",
+            choices=sorted(TARGETS),
+            help="Restrict to one kind of image.",
+        )
+        parser.add_argument("--batch-size", type=int, default=200)
+
+    def handle(self, *args, **options):
+        names = [options["only"]] if options["only"] else sorted(TARGETS)
+        rendered = 0
+
+        for name in names:
+            model, field_name, variants_field = TARGETS[name]
+            rows = (
+                model.objects
+                .exclude(**{field_name: ""})
+                .exclude(**{f"{field_name}__isnull": True})
+                .only("id", field_name, variants_field)
+            )
+
+            for instance in rows.iterator(chunk_size=options["batch_size"]):
+                if not needs_variants(instance, field_name, variants_field):
+                    continue
+                try:
+                    generate_variants(model, instance.pk, field_name, variants_field)
+                except Exception as e:
+                    self.stderr.write(f"{name} #{instance.pk}: {e}")
+                    continue
+                rendered += 1
+
+        if rendered:
+            bump_feed_version()
+        self.stdout.write(self.style.SUCCESS(f"Rendered variants for {rendered} image(s)."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from post import trending
+
+
+class Command(BaseCommand):
+    help = "Rebuild Post.trending_score from PostLike (run periodically or after changing the half-life)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        rescored = trending.recompute(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rescored {rescored} post(s)."))
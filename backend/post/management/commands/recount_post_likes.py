@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from post.cache import bump_feed_version
+from post.models import Post, PostLike
+
+
+class Command(BaseCommand):
+    help = "Recompute Post.likes_count for posts whose counter drifted from PostLike."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drifted posts without writing.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+
+        counts = (
+            PostLike.objects
+            .filter(post=OuterRef("pk"))
+            .order_by()
+            .values("post")
+            .annotate(total=Count("id"))
+            .values("total")
+        )
+        drifted = (
+            Post.objects
+            .annotate(actual=Coalesce(Subquery(counts), 0))
+            .exclude(likes_count=F("actual"))
+            .values_list("id", "actual")
+        )
+
+        fixed = 0
+        batch = []
+        for post_id, actual in drifted.iterator(chunk_size=batch_size):
+            batch.append(Post(id=post_id, likes_count=actual))
+            if len(batch) >= batch_size:
+                fixed += self.flush(batch, options["dry_run"])
+                batch = []
+        fixed += self.flush(batch, options["dry_run"])
+
+        if fixed and not options["dry_run"]:
+            bump_feed_version()
+
+        verb = "Would fix" if options["dry_run"] else "Fixed"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {fixed} post counter(s)."))
+
+    def flush(self, batch, dry_run):
+        if batch and not dry_run:
+            with transaction.atomic():
+                Post.objects.bulk_update(batch, ["likes_count"])
+        return len(batch)
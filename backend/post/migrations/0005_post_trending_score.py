@@ -0,0 +1,85 @@
+# Generated by Django 5.0.14 on 2026-10-18 13:05
+
+import math
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F, Func, Max, Min, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Exp, Greatest, Ln
+
+# Frozen copy of the post.trending math as of this migration, so later
+# changes to that module or to settings can't alter or break it. The
+# half-life is the 24 hour default.
+EPOCH = '2025-01-01 00:00:00'
+TAU = 24 * 3600 / math.log(2)
+MIN_EXPONENT = -700.0
+
+
+class SecondsSinceEpoch(Func):
+    arity = 1
+    output_field = models.FloatField()
+    template = f"EXTRACT(EPOCH FROM (%(expressions)s - TIMESTAMP WITH TIME ZONE '{EPOCH}+00'))"
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        template = f"((julianday(%(expressions)s) - julianday('{EPOCH}')) * 86400.0)"
+        return self.as_sql(compiler, connection, template=template, **extra_context)
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        template = f"(TIMESTAMPDIFF(MICROSECOND, '{EPOCH}', %(expressions)s) / 1000000.0)"
+        return self.as_sql(compiler, connection, template=template, **extra_context)
+
+
+def decay_units(field):
+    return SecondsSinceEpoch(field) / Value(TAU)
+
+
+def backfill_trending_score(apps, schema_editor):
+    Post = apps.get_model('post', 'Post')
+    PostLike = apps.get_model('post', 'PostLike')
+
+    # log-sum-exp in the database: park each post's largest exponent in
+    # the column, then add the log of the exponentials relative to it
+    likes = PostLike.objects.filter(post=OuterRef('pk')).order_by().values('post')
+    newest_like = likes.annotate(top=Max(decay_units('created_at'))).values('top')
+    likes_sum = likes.annotate(
+        total=Sum(Exp(Greatest(decay_units('created_at') - OuterRef('trending_score'), Value(MIN_EXPONENT))))
+    ).values('total')
+    created = decay_units('created_at')
+    top = F('trending_score')
+
+    bounds = Post.objects.aggregate(first=Min('id'), last=Max('id'))
+    if bounds['first'] is None:
+        return
+
+    for start in range(bounds['first'], bounds['last'] + 1, 1000):
+        posts = Post.objects.filter(id__gte=start, id__lt=start + 1000)
+        posts.update(trending_score=Greatest(created, Coalesce(Subquery(newest_like), created)))
+        posts.update(
+            trending_score=top + Ln(
+                Exp(Greatest(created - top, Value(MIN_EXPONENT)))
+                + Coalesce(Subquery(likes_sum), Value(0.0))
+            )
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('menu', '0004_food_updated_at_menuitems_updated_at'),
+        ('post', '0004_post_image_variants'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='trending_score',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['-trending_score', '-id'], name='post_trending_idx'),
+        ),
+        migrations.RunPython(backfill_trending_score, migrations.RunPython.noop),
+    ]
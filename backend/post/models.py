@@ -1,6 +1,8 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 from menu.models import Food
+from .trending import decay_units
 
 # Create your models here.
 
@@ -11,12 +13,29 @@ class Post(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE,related_name='posts')
     caption = models.TextField(null=True) #can be null or blank if not sent data
     image = models.ImageField(null=True, blank=True, upload_to='post_images/')
+    # storage names of the downscaled copies, see backend.images
+    image_variants = models.JSONField(default=dict, blank=True)
     food = models.ForeignKey(Food, on_delete=models.SET_NULL ,null=True, blank=True,related_name='posts')
+    # denormalized; kept in step with PostLike by ToggleLikeView (see recount_post_likes)
+    likes_count = models.PositiveIntegerField(default=0)
+    # log-space decayed like score, see post.trending
+    trending_score = models.FloatField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
-    def likes_count(self):
-        return self.likes.count()
+    class Meta:
+        indexes = [
+            # keyset pagination: (created_at, id) < cursor, newest first
+            models.Index(fields=["-created_at", "-id"], name="post_feed_idx"),
+            models.Index(fields=["user", "-created_at", "-id"], name="post_user_feed_idx"),
+            models.Index(fields=["-trending_score", "-id"], name="post_trending_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self._state.adding and not self.trending_score:
+            # a new post starts as if it had a single like from right now
+            self.trending_score = decay_units(timezone.now())
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.user}: {self.caption}"
@@ -0,0 +1,20 @@
+from django.conf import settings
+
+from backend.pagination import KeysetPagination
+
+
+class PostFeedPagination(KeysetPagination):
+    page_size = settings.POST_FEED_PAGE_SIZE
+    max_page_size = settings.POST_FEED_MAX_PAGE_SIZE
+
+
+class TrendingPagination(KeysetPagination):
+    ordering_field = "trending_score"
+    page_size = settings.POST_FEED_PAGE_SIZE
+    max_page_size = settings.POST_FEED_MAX_PAGE_SIZE
+
+    def encode_position(self, value):
+        return value
+
+    def decode_position(self, raw):
+        return float(raw)
@@ -1,7 +1,9 @@
 from rest_framework import serializers
 from .models import Post, PostLike
+from .viewer_state import ViewerState
 from menu.models import Food
 from django.contrib.auth import get_user_model
+from backend.images import variant_urls
 
 User = get_user_model()
 class PostUserSerializer(serializers.ModelSerializer):
@@ -13,14 +15,18 @@ class PostUserSerializer(serializers.ModelSerializer):
 
     def get_profile_picture(self, obj):
         if hasattr(obj, "profile") and obj.profile.profile_picture:
-            return obj.profile.profile_picture.url
+            profile = obj.profile
+            urls = variant_urls(profile.profile_picture, profile.picture_variants)
+            if urls:
+                return urls["thumb"]["webp"]
+            return profile.profile_picture.url
         
         return None
 
 class PostSerializer(serializers.ModelSerializer):
     user = PostUserSerializer(read_only=True)
-    likes_count = serializers.IntegerField(source='likes.count',read_only=True)
     is_liked = serializers.SerializerMethodField()
+    image_variants = serializers.SerializerMethodField()
     
     is_favourited = serializers.SerializerMethodField()
 
@@ -30,6 +36,7 @@ class PostSerializer(serializers.ModelSerializer):
             "id",
             "user",
             "image",
+            "image_variants",
             "food",
             "caption",
             "likes_count",
@@ -37,19 +44,24 @@ class PostSerializer(serializers.ModelSerializer):
             "is_liked",
             "created_at",
         )
+        read_only_fields = ("likes_count",)
 
-    def get_is_liked(self,obj):
-        user = self.context['request'].user
-        if user.is_anonymous:
-            return False
-        return obj.likes.filter(user=user).exists()
+    def get_image_variants(self, obj):
+        # None until the background worker has rendered them
+        return variant_urls(obj.image, obj.image_variants)
 
-    def get_is_favourited(self, obj):
-        user = self.context["request"].user
-        if user.is_anonymous or not obj.food:
-            return False
-        return user.profile.favourite_foods.filter(id=obj.food.id).exists()
+    def get_viewer_state(self, obj):
+        state = self.context.get("viewer_state")
+        if state is None:
+            # not preloaded by the view; fall back to this single post
+            state = ViewerState.load(self.context["request"].user, [obj])
+        return state
 
+    def get_is_liked(self, obj):
+        return self.get_viewer_state(obj).is_liked(obj)
+
+    def get_is_favourited(self, obj):
+        return self.get_viewer_state(obj).is_favourited(obj)
 
 
 class PostCreateSerializer(serializers.ModelSerializer):
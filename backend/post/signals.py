@@ -0,0 +1,20 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Post, PostLike
+from .cache import bump_feed_version
+from backend.images import schedule_variants
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=PostLike)
+@receiver(post_delete, sender=PostLike)
+def invalidate_feed(sender, **kwargs):
+    # after commit, so a concurrent reader can't re-cache the old rows
+    transaction.on_commit(bump_feed_version)
+
+
+@receiver(post_save, sender=Post)
+def render_image_variants(sender, instance, **kwargs):
+    schedule_variants(instance, "image", "image_variants", on_done=bump_feed_version)
@@ -1,3 +1,148 @@
+import math
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from profiles.models import Profile
+from . import trending
+from .models import Post, PostLike
+
+User = get_user_model()
+
+
+class FeedCursorTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.author = User.objects.create_user(username="author", email="author@example.com", password="x")
+        self.other = User.objects.create_user(username="other", email="other@example.com", password="x")
+
+        now = timezone.now()
+        self.posts = []
+        for i in range(7):
+            post = Post.objects.create(user=self.author if i % 2 else self.other, caption=f"post {i}")
+            # pairs share a timestamp, so pages must break ties on id
+            Post.objects.filter(id=post.id).update(created_at=now - timedelta(minutes=i // 2))
+            self.posts.append(post)
+
+    def newest_first(self, posts):
+        posts = Post.objects.filter(id__in=[post.id for post in posts])
+        return list(posts.order_by("-created_at", "-id").values_list("id", flat=True))
+
+    def walk(self, url):
+        pages, seen = [], []
+        while url:
+            page = self.client.get(url).json()
+            pages.append(page)
+            seen += [post["id"] for post in page["results"]]
+            url = page["next"]
+        return pages, seen
+
+    def test_next_links_cover_the_feed_once_in_order(self):
+        pages, seen = self.walk("/api/posts/?page_size=2")
+
+        self.assertEqual(seen, self.newest_first(self.posts))
+        self.assertEqual(len(pages), 4)
+        self.assertIsNone(pages[0]["previous"])
+
+    def test_previous_link_returns_the_page_before(self):
+        first = self.client.get("/api/posts/?page_size=3").json()
+        second = self.client.get(first["next"]).json()
+        back = self.client.get(second["previous"]).json()
+
+        self.assertEqual([post["id"] for post in back["results"]], [post["id"] for post in first["results"]])
+        self.assertIsNone(back["previous"])
+
+    def test_new_posts_do_not_shift_later_pages(self):
+        first = self.client.get("/api/posts/?page_size=3").json()
+        Post.objects.create(user=self.author, caption="late arrival")
+        _, rest = self.walk(first["next"])
+
+        seen = [post["id"] for post in first["results"]] + rest
+        self.assertEqual(seen, self.newest_first(self.posts))
+
+    def test_user_feed_pages_only_that_user(self):
+        _, seen = self.walk(f"/api/posts/user/{self.author.id}/?page_size=2")
+
+        self.assertEqual(seen, self.newest_first([post for post in self.posts if post.user_id == self.author.id]))
+
+    def test_full_stream_is_staff_only(self):
+        self.assertEqual(self.client.get("/api/posts/?stream=1").status_code, 401)
+
+        self.client.force_authenticate(self.author)
+        self.assertEqual(self.client.get("/api/posts/?stream=1").status_code, 403)
+
+        self.client.force_authenticate(User.objects.create_user(
+            username="staff", email="staff@example.com", password="x", is_staff=True
+        ))
+        response = self.client.get("/api/posts/?stream=1")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+
+    def test_invalid_cursor_is_not_found(self):
+        self.assertEqual(self.client.get("/api/posts/?cursor=not-a-cursor").status_code, 404)
+
+
+class PostDetailEtagTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username="author", email="author@example.com", password="x")
+        self.post = Post.objects.create(user=self.author, caption="momo")
+        self.url = f"/api/posts/{self.post.id}/"
+        self.client = APIClient()
+
+    def assertChanged(self, etag):
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        return response["ETag"]
+
+    def test_author_changes_change_the_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        # neither write moves a timestamp
+        User.objects.filter(id=self.author.id).update(username="renamed")
+        etag = self.assertChanged(etag)
+
+        Profile.objects.filter(user=self.author).update(picture_variants={"thumb": {"webp": "thumb.webp"}})
+        self.assertChanged(etag)
+
+
+class TrendingRecomputeTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username="author", email="author@example.com", password="x")
+        self.fans = [
+            User.objects.create_user(username=f"fan{i}", email=f"fan{i}@example.com", password="x") for i in range(4)
+        ]
+
+    def expected(self, post):
+        post.refresh_from_db()
+        units = [trending.decay_units(post.created_at)] + [
+            trending.decay_units(liked_at) for liked_at in post.likes.values_list("created_at", flat=True)
+        ]
+        top = max(units)
+        return top + math.log(math.fsum(math.exp(unit - top) for unit in units))
+
+    def test_scores_match_the_log_sum_of_likes(self):
+        now = timezone.now()
+        # liked years after it was posted: e^(like - created) overflows a double
+        old = Post.objects.create(user=self.author, caption="old")
+        Post.objects.filter(id=old.id).update(created_at=now - timedelta(days=1500), trending_score=0)
+        unliked = Post.objects.create(user=self.author, caption="unliked")
+        Post.objects.filter(id=unliked.id).update(trending_score=0)
+
+        for hours, fan in enumerate(self.fans):
+            like = PostLike.objects.create(user=fan, post=old)
+            PostLike.objects.filter(id=like.id).update(created_at=now - timedelta(hours=hours * 5))
+
+        # the id range, then per batch two UPDATEs inside a savepoint,
+        # whatever the number of likes
+        with self.assertNumQueries(1 + 2 * (2 + 2)):
+            self.assertEqual(trending.recompute(batch_size=1), 2)
 
-# Create your tests here.
+        for post in (old, unliked):
+            expected = self.expected(post)
+            self.assertAlmostEqual(Post.objects.get(id=post.id).trending_score, expected, places=6)
@@ -0,0 +1,116 @@
+"""
+Time-decayed trending score for posts.
+
+    score = ln( e^x(post.created_at) + sum over likes of e^x(like.created_at) )
+    x(t)  = (t - EPOCH) / tau,   tau = half-life / ln 2
+
+Each like's weight halves every TRENDING_HALF_LIFE_HOURS, and the post's
+own creation counts as one like so fresh posts surface before old ones
+nobody liked. Because every post decays by the same factor as time passes,
+the ordering never changes on its own: nothing has to be recomputed per
+request, and a like or unlike is an O(1) log-add/log-subtract on the row,
+done in the UPDATE that already maintains likes_count.
+
+`recompute_trending` rebuilds all scores from PostLike inside the
+database, with two set-based UPDATEs per batch of post ids (after changing
+the half-life, or to repair drift).
+"""
+
+import math
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, FloatField, Func, Max, Min, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Abs, Coalesce, Exp, Greatest, Ln
+
+EPOCH = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+TAU = settings.TRENDING_HALF_LIFE_HOURS * 3600 / math.log(2)
+
+# unlike can't drop the score below this fraction of what it removes
+_MIN_REMAINDER = 1e-12
+
+# exponents are clamped here: e^-700 is already nothing next to 1, and
+# PostgreSQL raises on float underflow instead of returning 0
+_MIN_EXPONENT = -700.0
+
+
+def decay_units(when):
+    return (when - EPOCH).total_seconds() / TAU
+
+
+class SecondsSinceEpoch(Func):
+    """Seconds from EPOCH to a stored datetime, computed by the database."""
+
+    arity = 1
+    output_field = FloatField()
+    # datetimes are stored in UTC on every backend Django supports here
+    template = f"EXTRACT(EPOCH FROM (%(expressions)s - TIMESTAMP WITH TIME ZONE '{EPOCH:%Y-%m-%d %H:%M:%S}+00'))"
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        template = f"((julianday(%(expressions)s) - julianday('{EPOCH:%Y-%m-%d %H:%M:%S}')) * 86400.0)"
+        return self.as_sql(compiler, connection, template=template, **extra_context)
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        template = f"(TIMESTAMPDIFF(MICROSECOND, '{EPOCH:%Y-%m-%d %H:%M:%S}', %(expressions)s) / 1000000.0)"
+        return self.as_sql(compiler, connection, template=template, **extra_context)
+
+
+def decay_units_of(field):
+    """Expression for decay_units() of a datetime column."""
+    return SecondsSinceEpoch(field) / Value(TAU)
+
+
+def like_added(liked_at):
+    """Expression for trending_score after one more like at `liked_at`."""
+    score = F("trending_score")
+    x = Value(decay_units(liked_at))
+    return Greatest(score, x) + Ln(Value(1.0) + Exp(-Abs(score - x)))
+
+
+def like_removed(liked_at, created_at):
+    """Expression for trending_score after removing a like from `liked_at`."""
+    score = F("trending_score")
+    x = Value(decay_units(liked_at))
+    remainder = Greatest(Value(1.0) - Exp(x - score), Value(_MIN_REMAINDER))
+    return Greatest(score + Ln(remainder), Value(decay_units(created_at)))
+
+
+def recompute(batch_size=1000):
+    """
+    Rebuild every post's score from its likes, without reading a like
+    into Python.
+
+    Each batch of post ids takes two UPDATEs: the first parks the largest
+    exponent of each post (its creation or newest like) in trending_score,
+    the second adds the log of the exponentials summed relative to it, so
+    nothing overflows however old the post. Returns the number of posts
+    rescored.
+    """
+    from .models import Post, PostLike
+
+    likes = PostLike.objects.filter(post=OuterRef("pk")).order_by().values("post")
+    newest_like = likes.annotate(top=Max(decay_units_of("created_at"))).values("top")
+    likes_sum = likes.annotate(
+        total=Sum(Exp(Greatest(decay_units_of("created_at") - OuterRef("trending_score"), Value(_MIN_EXPONENT))))
+    ).values("total")
+
+    created = decay_units_of("created_at")
+    top = F("trending_score")
+
+    bounds = Post.objects.aggregate(first=Min("id"), last=Max("id"))
+    if bounds["first"] is None:
+        return 0
+
+    rescored = 0
+    for start in range(bounds["first"], bounds["last"] + 1, batch_size):
+        posts = Post.objects.filter(id__gte=start, id__lt=start + batch_size)
+        with transaction.atomic():
+            rescored += posts.update(trending_score=Greatest(created, Coalesce(Subquery(newest_like), created)))
+            posts.update(
+                trending_score=top + Ln(
+                    Exp(Greatest(created - top, Value(_MIN_EXPONENT)))
+                    + Coalesce(Subquery(likes_sum), Value(0.0))
+                )
+            )
+    return rescored
@@ -1,6 +1,7 @@
 from django.urls import path
 from .views import (
     PostListView,
+    TrendingPostsView,
     PostDetailPublicView,
     PostCreateView,
     PostUpdateDeleteView,
@@ -12,6 +13,7 @@ from .views import (
 
 urlpatterns = [
     path("", PostListView.as_view()),
+    path("trending/", TrendingPostsView.as_view()),
 
     path("me/", MyPostView.as_view()),
     path("user/<int:userId>/",UserSpecificPostsView.as_view()),
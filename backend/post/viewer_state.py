@@ -0,0 +1,83 @@
+from profiles.models import Profile
+from .models import PostLike
+
+
+FavouriteFood = Profile.favourite_foods.through
+
+
+class ViewerState:
+    """
+    What the requesting user has liked / favourited, for one batch of posts.
+
+    Loaded once per response with two queries (likes, favourite foods),
+    instead of two queries per serialized post.
+    """
+
+    def __init__(self, liked_post_ids=(), favourite_food_ids=()):
+        self.liked_post_ids = frozenset(liked_post_ids)
+        self.favourite_food_ids = frozenset(favourite_food_ids)
+
+    @classmethod
+    def load(cls, user, posts):
+        return cls.load_ids(
+            user,
+            [post.id for post in posts],
+            {post.food_id for post in posts if post.food_id},
+        )
+
+    @classmethod
+    def load_ids(cls, user, post_ids, food_ids):
+        if user is None or user.is_anonymous:
+            return cls()
+
+        liked = []
+        if post_ids:
+            liked = (
+                PostLike.objects
+                .filter(user=user, post_id__in=post_ids)
+                .values_list("post_id", flat=True)
+            )
+
+        favourites = []
+        if food_ids:
+            favourites = (
+                FavouriteFood.objects
+                .filter(profile__user=user, food_id__in=food_ids)
+                .values_list("food_id", flat=True)
+            )
+
+        return cls(liked, favourites)
+
+    @classmethod
+    def load_serialized(cls, user, items):
+        """Same as load(), from already serialized PostSerializer rows."""
+        return cls.load_ids(
+            user,
+            [item["id"] for item in items],
+            {item["food"] for item in items if item["food"]},
+        )
+
+    def is_liked(self, post):
+        return post.id in self.liked_post_ids
+
+    def is_favourited(self, post):
+        return post.food_id is not None and post.food_id in self.favourite_food_ids
+
+    def apply(self, items):
+        """Copy serialized rows with is_liked / is_favourited filled in."""
+        return [
+            {
+                **item,
+                "is_liked": item["id"] in self.liked_post_ids,
+                "is_favourited": item["food"] in self.favourite_food_ids,
+            }
+            for item in items
+        ]
+
+
+def post_serializer_context(request, posts):
+    """Serializer context for PostSerializer with viewer state preloaded."""
+    return {
+        "request": request,
+        "viewer_state": ViewerState.load(request.user, posts),
+    }
@@ -5,50 +5,126 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import permissions, status
 from django.shortcuts import get_object_or_404
+from django.db import transaction
+from django.db.models import F
 from rest_framework.permissions import AllowAny
 from .models import Post, PostLike
 from .serializers import PostSerializer, PostCreateSerializer
+from .pagination import PostFeedPagination, TrendingPagination
+from .trending import like_added, like_removed
+from .viewer_state import ViewerState, post_serializer_context
+from .cache import get_cached_feed_page
 from profiles.models import Profile
+from backend.conditional import make_etag, add_validators, not_modified_response
+from backend.streaming import wants_stream, stream_json_array
 from rest_framework.parsers import MultiPartParser,FormParser
+from idempotency.decorators import idempotent
 
 class PostListView(APIView):
     permission_classes = [permissions.AllowAny]
 
     def get(self, request):
+        if wants_stream(request):
+            # the whole table in one response is an export, not a feed page
+            if not request.user.is_staff:
+                self.permission_denied(request, message="Streaming every post is staff only.")
+            posts = (
+                Post.objects
+                .select_related("user__profile")
+                .order_by("-created_at", "-id")
+            )
+            return stream_json_array(
+                posts,
+                PostSerializer,
+                context_for_chunk=lambda chunk: post_serializer_context(request, chunk),
+            )
+
+        body = get_cached_feed_page(request, lambda: self.build_page(request))
+        state = ViewerState.load_serialized(request.user, body["results"])
+
+        return Response({**body, "results": state.apply(body["results"])})
+
+    def build_page(self, request):
         posts = (
             Post.objects
             .select_related("user__profile")
-            .prefetch_related("likes")
-            .order_by("-created_at")
         )
 
+        paginator = PostFeedPagination()
+        page = paginator.paginate_queryset(posts, request, view=self)
         serializer = PostSerializer(
-            posts,
+            page,
             many=True,
-            context={"request": request}
+            context={"request": request, "viewer_state": ViewerState()}
         )
-        return Response(serializer.data)
+        return paginator.get_paginated_response(serializer.data).data
 
 
-class PostDetailPublicView(APIView):
+class TrendingPostsView(APIView):
     permission_classes = [permissions.AllowAny]
 
-    def get(self, request, post_id):
-        post = (
+    def get(self, request):
+        posts = (
             Post.objects
             .select_related("user__profile")
-            .prefetch_related("likes")
-            .get(id=post_id)
         )
 
-        serializer = PostSerializer(post, context={"request": request})
-        return Response(serializer.data)
+        paginator = TrendingPagination()
+        page = paginator.paginate_queryset(posts, request, view=self)
+        serializer = PostSerializer(
+            page,
+            many=True,
+            context=post_serializer_context(request, page)
+        )
+        return paginator.get_paginated_response(serializer.data)
+
+
+class PostDetailPublicView(APIView):
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request, post_id):
+        post = get_object_or_404(
+            Post.objects.select_related("user__profile"),
+            id=post_id
+        )
+        state = ViewerState.load(request.user, [post])
+
+        modified = post.updated_at
+        profile = getattr(post.user, "profile", None)
+        if profile is not None:
+            modified = max(modified, profile.updated_at)
+
+        # the embedded author (username, avatar) and image variants are
+        # rewritten without moving updated_at, so they go in directly
+        etag = make_etag(
+            "post",
+            post.id,
+            modified,
+            post.image_variants,
+            post.user.username,
+            profile.profile_picture.name if profile is not None else None,
+            profile.picture_variants if profile is not None else None,
+            post.likes_count,
+            request.user.pk,
+            state.is_liked(post),
+            state.is_favourited(post),
+        )
+        response = not_modified_response(request, etag, modified)
+        if response is not None:
+            return response
+
+        serializer = PostSerializer(
+            post,
+            context={"request": request, "viewer_state": state}
+        )
+        return add_validators(Response(serializer.data), etag, modified)
 
 
 class PostCreateView(APIView):
     permission_classes = [permissions.IsAuthenticated]
     parser_classes = [MultiPartParser, FormParser]
 
+    @idempotent
     def post(self, request):
         serializer = PostCreateSerializer(
             data=request.data,
@@ -62,12 +138,14 @@ class PostCreateView(APIView):
                 post = (
                     Post.objects
                     .select_related("user__profile")
-                    .prefetch_related("likes")
                     .get(id=post.id)
                 )
 
                 return Response(
-                    PostSerializer(post, context={"request": request}).data,
+                    PostSerializer(
+                        post,
+                        context=post_serializer_context(request, [post])
+                    ).data,
                     status=status.HTTP_201_CREATED
                 )
             except Exception as e:
@@ -103,12 +181,14 @@ class PostUpdateDeleteView(APIView):
             post = (
                 Post.objects
                 .select_related("user__profile")
-                .prefetch_related("likes")
                 .get(id=post.id)
             )
 
             return Response(
-                PostSerializer(post, context={"request": request}).data
+                PostSerializer(
+                    post,
+                    context=post_serializer_context(request, [post])
+                ).data
             )
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -129,16 +209,16 @@ class MyPostView(APIView):
             Post.objects
             .filter(user=request.user)
             .select_related("user__profile")
-            .prefetch_related("likes")
-            .order_by("-created_at")
         )
 
+        paginator = PostFeedPagination()
+        page = paginator.paginate_queryset(posts, request, view=self)
         serializer = PostSerializer(
-            posts,
+            page,
             many=True,
-            context={"request": request}
+            context=post_serializer_context(request, page)
         )
-        return Response(serializer.data)
+        return paginator.get_paginated_response(serializer.data)
 
 class UserSpecificPostsView(APIView):
     permission_classes = [AllowAny]
@@ -148,22 +228,24 @@ class UserSpecificPostsView(APIView):
             Post.objects
             .filter(user_id=userId)
             .select_related("user__profile")
-            .prefetch_related("likes")
-            .order_by("-created_at")
         )
 
+        paginator = PostFeedPagination()
+        page = paginator.paginate_queryset(posts, request, view=self)
         serializer = PostSerializer(
-            posts,
+            page,
             many=True,
-            context={"request": request}
+            context=post_serializer_context(request, page)
         )
-        return Response(serializer.data)
+        return paginator.get_paginated_response(serializer.data)
 
         
 
 class ToggleLikeView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
+    @idempotent
+    @transaction.atomic
     def post(self, request, post_id):
         post = get_object_or_404(Post, id=post_id)
 
@@ -174,11 +256,20 @@ class ToggleLikeView(APIView):
 
         if not created:
             like.delete()
+            Post.objects.filter(id=post.id, likes_count__gt=0).update(
+                likes_count=F("likes_count") - 1,
+                trending_score=like_removed(like.created_at, post.created_at),
+            )
             return Response(
                 {"liked": False},
                 status=status.HTTP_200_OK
             )
 
+        Post.objects.filter(id=post.id).update(
+            likes_count=F("likes_count") + 1,
+            trending_score=like_added(like.created_at),
+        )
+
         return Response(
             {"liked": True},
             status=status.HTTP_201_CREATED
@@ -187,6 +278,7 @@ class ToggleLikeView(APIView):
 class ToggleFoodToFavourite(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
+    @idempotent
     def post(self, request, post_id):
         post = get_object_or_404(Post, id=post_id)
 
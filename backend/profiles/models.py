@@ -14,6 +14,8 @@ class Profile(models.Model):
         blank=True,
         null=True
     )
+    # storage names of the downscaled copies, see backend.images
+    picture_variants = models.JSONField(default=dict, blank=True)
 
     bio = models.TextField(blank=True)
     favourite_foods = models.ManyToManyField(
@@ -23,6 +25,7 @@ class Profile(models.Model):
     )
 
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.user.username
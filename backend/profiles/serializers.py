@@ -5,11 +5,19 @@ from accounts.serializers import UserSerializer
 
 
 
+FAVOURITES_INLINE_LIMIT = 50
+
+
 class ProfileSerializer(serializers.ModelSerializer):
-    favourite_foods = FoodSerializer(many=True,read_only=True)
+    # the first few only; the full list is GET /api/profile/my/favourites/
+    favourite_foods = serializers.SerializerMethodField()
     user = UserSerializer()
 
 
     class Meta:
         model = Profile
         fields = ('id', 'user', 'bio', 'profile_picture', 'favourite_foods')
+
+    def get_favourite_foods(self, obj):
+        foods = obj.favourite_foods.order_by('id')[:FAVOURITES_INLINE_LIMIT]
+        return FoodSerializer(foods, many=True, context=self.context).data
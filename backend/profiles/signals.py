@@ -1,9 +1,33 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, m2m_changed
 from django.dispatch import receiver
 from django.conf import settings
+from django.utils import timezone
 from .models import Profile
+from backend.images import schedule_variants
 
 @receiver(post_save, sender=settings.AUTH_USER_MODEL)
 def create_profile(sender, instance, created, **kwargs):
     if created:
         Profile.objects.create(user=instance)
+
+
+@receiver(post_save, sender=Profile)
+def render_picture_variants(sender, instance, **kwargs):
+    schedule_variants(instance, "profile_picture", "picture_variants")
+
+
+@receiver(m2m_changed, sender=Profile.favourite_foods.through)
+def touch_profile_on_favourites_change(sender, instance, action, reverse, pk_set, **kwargs):
+    # .add()/.remove() don't save the profile; keep updated_at (and so
+    # the ProfileView ETag) moving when the favourites list changes
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if reverse and pk_set is None:
+        profiles = Profile.objects.filter(favourite_foods=instance)
+    elif reverse:
+        profiles = Profile.objects.filter(pk__in=pk_set)
+    else:
+        profiles = Profile.objects.filter(pk=instance.pk)
+
+    profiles.update(updated_at=timezone.now())
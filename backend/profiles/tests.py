@@ -1,3 +1,28 @@
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from menu.models import Food
+
+User = get_user_model()
+
+
+class ProfileEtagTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="diner", email="diner@example.com", password="x")
+        self.foods = [Food.objects.create(name=f"dish {i}", approved=True) for i in range(2)]
+        self.user.profile.favourite_foods.add(*self.foods)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_deleting_a_favourite_food_changes_the_etag(self):
+        etag = self.client.get("/api/profile/my/")["ETag"]
+        self.assertEqual(self.client.get("/api/profile/my/", HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        # the older one, so the newest updated_at stays put; the delete
+        # cascades through the m2m table without sending m2m_changed
+        self.foods[0].delete()
+
+        response = self.client.get("/api/profile/my/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["favourite_foods"]), 1)
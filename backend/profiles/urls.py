@@ -4,6 +4,7 @@ from .views import *
 
 urlpatterns = [
     path('my/', ProfileView.as_view()),
+    path('my/favourites/', FavouriteFoodsListView.as_view(), name="my-favourites"),
     path('myFavourites/<int:food_id>',FavouritesToggleView.as_view(), name="toggle-favourites"),
     path("<int:userId>/",OtherUserProfileView.as_view()),
 ]
@@ -1,18 +1,57 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework import permissions, status
+from rest_framework import generics, permissions, status
 from django.shortcuts import get_object_or_404
+from django.db.models import Count, Max, Sum
+from django.http import Http404
 from .models import Profile
 from .serializers import ProfileSerializer
 from menu.models import Food
+from menu.serializers import FoodSerializer
+from backend.conditional import make_etag, add_validators, not_modified_response
+from idempotency.decorators import idempotent
 
 class ProfileView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
+        # validator from one row read; the profile is only serialized on a miss
+        stats = (
+            Profile.objects
+            .filter(user=request.user)
+            # deleting a food drops it from favourites without touching
+            # any timestamp, so the set itself is part of the validator
+            .annotate(
+                favourites_modified=Max("favourite_foods__updated_at"),
+                favourites_count=Count("favourite_foods"),
+                favourites_id_sum=Sum("favourite_foods__id"),
+            )
+            .values_list(
+                "id",
+                "updated_at",
+                "favourites_modified",
+                "favourites_count",
+                "favourites_id_sum",
+                "user__username",
+                "user__email",
+                "user__first_name",
+                "user__last_name",
+            )
+            .first()
+        )
+        if stats is None:
+            raise Http404
+
+        modified = stats[1]
+        etag = make_etag("profile", *stats)
+
+        response = not_modified_response(request, etag, modified)
+        if response is not None:
+            return response
+
         profile = get_object_or_404(Profile, user=request.user)
         serializer = ProfileSerializer(profile,context={'request': request})
-        return Response(serializer.data)
+        return add_validators(Response(serializer.data), etag, modified)
 
     def patch(self, request):
         profile = get_object_or_404(Profile, user=request.user)
@@ -39,9 +78,21 @@ class OtherUserProfileView(APIView):
         return Response(serializer.data)
     
 
+class FavouriteFoodsListView(generics.ListAPIView):
+    """GET /api/profile/my/favourites/ - the user's favourite foods, paged."""
+
+    serializer_class = FoodSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    filter_fields = {'approved': 'approved', 'is_veg': 'is_veg'}
+
+    def get_queryset(self):
+        return Food.objects.filter(favourited_by__user=self.request.user)
+
+
 class FavouritesToggleView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
+    @idempotent
     def post(self, request, food_id):
         profile = get_object_or_404(Profile, user=request.user)
         food = get_object_or_404(Food, id=food_id)
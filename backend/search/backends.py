@@ -0,0 +1,85 @@
+"""
+Ranked full-text queries against SearchDocument, one per database vendor.
+
+Every variant reads the text index created in migration 0002. Terms are
+prefix-matched so partial words ("mom" -> "momo") work while typing.
+Other databases are refused by the "search" system check at startup.
+"""
+
+import re
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+
+MAX_TERMS = 8
+
+
+def parse_terms(query):
+    return re.findall(r"\w+", query or "")[:MAX_TERMS]
+
+
+def _postgresql(terms, kinds, limit, offset):
+    tsquery = " & ".join(f"{term}:*" for term in terms)
+    sql = """
+        SELECT d.kind, d.object_id, ts_rank(to_tsvector('simple', d.body), q) AS score
+        FROM search_searchdocument d, to_tsquery('simple', %s) q
+        WHERE to_tsvector('simple', d.body) @@ q AND d.kind = ANY(%s)
+        ORDER BY score DESC, d.id DESC
+        LIMIT %s OFFSET %s
+    """
+    return sql, [tsquery, list(kinds), limit, offset]
+
+
+def _mysql(terms, kinds, limit, offset):
+    against = " ".join(f"+{term}*" for term in terms)
+    placeholders = ", ".join(["%s"] * len(kinds))
+    sql = f"""
+        SELECT d.kind, d.object_id, MATCH(d.body) AGAINST (%s IN BOOLEAN MODE) AS score
+        FROM search_searchdocument d
+        WHERE MATCH(d.body) AGAINST (%s IN BOOLEAN MODE) AND d.kind IN ({placeholders})
+        ORDER BY score DESC, d.id DESC
+        LIMIT %s OFFSET %s
+    """
+    return sql, [against, against, *kinds, limit, offset]
+
+
+def _sqlite(terms, kinds, limit, offset):
+    match = " AND ".join('"{}"*'.format(term.replace('"', "")) for term in terms)
+    placeholders = ", ".join(["%s"] * len(kinds))
+    sql = f"""
+        SELECT d.kind, d.object_id, -bm25(search_fts) AS score
+        FROM search_fts
+        JOIN search_searchdocument d ON d.id = search_fts.rowid
+        WHERE search_fts MATCH %s AND d.kind IN ({placeholders})
+        ORDER BY score DESC, d.id DESC
+        LIMIT %s OFFSET %s
+    """
+    return sql, [match, *kinds, limit, offset]
+
+
+QUERIES = {
+    "postgresql": _postgresql,
+    "mysql": _mysql,
+    "sqlite": _sqlite,
+}
+
+
+def search(query, kinds, limit, offset=0):
+    """Return [(kind, object_id, score), ...] best match first."""
+    terms = parse_terms(query)
+    if not terms or not kinds:
+        return []
+
+    build = QUERIES.get(connection.vendor)
+    if build is None:
+        raise ImproperlyConfigured(f"Full-text search is not supported on {connection.vendor}")
+
+    sql, params = build(terms, kinds, limit, offset)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [(kind, object_id, float(score)) for kind, object_id, score in cursor.fetchall()]
+
+
+def search_ids(query, kind, limit):
+    """Matching object ids of one kind, for narrowing a queryset."""
+    return [object_id for _, object_id, _ in search(query, [kind], limit)]
@@ -0,0 +1,18 @@
+from django.core import checks
+from django.db import connection
+
+from .backends import QUERIES
+
+
+@checks.register("search")
+def check_database_vendor(app_configs, **kwargs):
+    """Search reads a vendor-specific text index; there is no slow fallback."""
+    if connection.vendor in QUERIES:
+        return []
+    return [
+        checks.Error(
+            f"Full-text search is not supported on {connection.vendor}.",
+            hint=f"Use one of: {', '.join(sorted(QUERIES))}.",
+            id="search.E001",
+        )
+    ]
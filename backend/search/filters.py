@@ -0,0 +1,34 @@
+from django.db.models import Case, IntegerField, When
+from rest_framework.filters import BaseFilterBackend
+
+from .backends import search_ids
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """
+    `?search=` for generic list views, answered from the search index.
+
+    Views set `search_kind` (which documents to match) and optionally
+    `search_id_field` (the queryset field holding that object's id).
+    Matches come back best first; the pagination keeps that order.
+    """
+
+    search_param = "search"
+    max_matches = 500
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, "").strip()
+        if not query:
+            return queryset
+
+        kind = getattr(view, "search_kind")
+        field = getattr(view, "search_id_field", "pk")
+        ids = search_ids(query, kind, self.max_matches)
+        if not ids:
+            return queryset.none()
+
+        rank = Case(
+            *[When(**{field: object_id}, then=position) for position, object_id in enumerate(ids)],
+            output_field=IntegerField(),
+        )
+        return queryset.filter(**{f"{field}__in": ids}).order_by(rank)
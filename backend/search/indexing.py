@@ -0,0 +1,92 @@
+from django.contrib.auth import get_user_model
+
+from menu.models import Food
+from post.models import Post
+from .models import SearchDocument
+
+User = get_user_model()
+
+
+def post_body(post):
+    parts = [post.caption or ""]
+    if post.food_id:
+        parts.append(post.food.name)
+    return " ".join(parts)
+
+
+def food_body(food):
+    return f"{food.name} {food.description}"
+
+
+def user_body(user):
+    return f"{user.username} {user.first_name} {user.last_name}"
+
+
+# kind -> (model, body builder, queryset used for bulk rebuilds)
+INDEXED = {
+    "post": (Post, post_body, lambda: Post.objects.select_related("food")),
+    "food": (Food, food_body, lambda: Food.objects.all()),
+    "user": (User, user_body, lambda: User.objects.all()),
+}
+
+KIND_FOR_MODEL = {model: kind for kind, (model, _, _) in INDEXED.items()}
+
+
+def index_object(kind, obj):
+    body = INDEXED[kind][1](obj).strip()
+    SearchDocument.objects.update_or_create(
+        kind=kind,
+        object_id=obj.pk,
+        defaults={"body": body},
+    )
+
+
+def index_objects(kind, objs, batch_size=1000):
+    """Add documents for newly created objects (e.g. after bulk_create)."""
+    build_body = INDEXED[kind][1]
+    SearchDocument.objects.bulk_create(
+        [SearchDocument(kind=kind, object_id=obj.pk, body=build_body(obj).strip()) for obj in objs],
+        batch_size=batch_size,
+    )
+
+
+def reindex_posts(posts, batch_size=1000):
+    """
+    Rewrite the documents of existing `posts`, e.g. after the food they
+    name was renamed or deleted; returns how many were rewritten.
+    """
+    written = 0
+    ids = list(posts.values_list("pk", flat=True))
+    for start in range(0, len(ids), batch_size):
+        bodies = {
+            post.pk: post_body(post).strip()
+            for post in Post.objects.filter(pk__in=ids[start:start + batch_size]).select_related("food")
+        }
+        documents = list(SearchDocument.objects.filter(kind="post", object_id__in=bodies))
+        for document in documents:
+            document.body = bodies[document.object_id]
+        SearchDocument.objects.bulk_update(documents, ["body"])
+        written += len(documents)
+    return written
+
+
+def unindex_object(kind, pk):
+    SearchDocument.objects.filter(kind=kind, object_id=pk).delete()
+
+
+def rebuild(kind, batch_size=1000):
+    """Replace every document of `kind`; returns how many were written."""
+    _, build_body, queryset = INDEXED[kind]
+    SearchDocument.objects.filter(kind=kind).delete()
+
+    written = 0
+    batch = []
+    for obj in queryset().iterator(chunk_size=batch_size):
+        batch.append(SearchDocument(kind=kind, object_id=obj.pk, body=build_body(obj).strip()))
+        if len(batch) >= batch_size:
+            SearchDocument.objects.bulk_create(batch)
+            written += len(batch)
+            batch = []
+
+    SearchDocument.objects.bulk_create(batch)
+    return written + len(batch)
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from search.indexing import INDEXED, rebuild
+
+
+class Command(BaseCommand):
+    help = "Rebuild search documents for posts, foods and users from their tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--only", choices=sorted(INDEXED))
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        kinds = [options["only"]] if options["only"] else sorted(INDEXED)
+
+        for kind in kinds:
+            written = rebuild(kind, batch_size=options["batch_size"])
+            self.stdout.write(f"{kind}: {written} document(s)")
+
+        self.stdout.write(self.style.SUCCESS("Search index rebuilt."))
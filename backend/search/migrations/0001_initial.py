@@ -0,0 +1,27 @@
+# Generated by Django 5.0.14 on 2026-10-18 13:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('post', 'Post'), ('food', 'Food'), ('user', 'User')], max_length=10)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('body', models.TextField()),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='searchdocument',
+            constraint=models.UniqueConstraint(fields=('kind', 'object_id'), name='search_doc_kind_object_uniq'),
+        ),
+    ]
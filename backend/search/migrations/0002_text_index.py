@@ -0,0 +1,76 @@
+from django.db import migrations
+
+
+FORWARD = {
+    'postgresql': [
+        "CREATE INDEX search_doc_body_gin ON search_searchdocument "
+        "USING GIN (to_tsvector('simple', body))",
+    ],
+    'mysql': [
+        "CREATE FULLTEXT INDEX search_doc_body_ft ON search_searchdocument (body)",
+    ],
+    'sqlite': [
+        "CREATE VIRTUAL TABLE search_fts USING fts5("
+        "body, content='search_searchdocument', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        "CREATE TRIGGER search_doc_ai AFTER INSERT ON search_searchdocument BEGIN "
+        "INSERT INTO search_fts(rowid, body) VALUES (new.id, new.body); END",
+        "CREATE TRIGGER search_doc_ad AFTER DELETE ON search_searchdocument BEGIN "
+        "INSERT INTO search_fts(search_fts, rowid, body) VALUES ('delete', old.id, old.body); END",
+        "CREATE TRIGGER search_doc_au AFTER UPDATE ON search_searchdocument BEGIN "
+        "INSERT INTO search_fts(search_fts, rowid, body) VALUES ('delete', old.id, old.body); "
+        "INSERT INTO search_fts(rowid, body) VALUES (new.id, new.body); END",
+    ],
+}
+
+BACKWARD = {
+    'postgresql': ["DROP INDEX search_doc_body_gin"],
+    'mysql': ["DROP INDEX search_doc_body_ft ON search_searchdocument"],
+    'sqlite': [
+        "DROP TRIGGER search_doc_au",
+        "DROP TRIGGER search_doc_ad",
+        "DROP TRIGGER search_doc_ai",
+        "DROP TABLE search_fts",
+    ],
+}
+
+
+def run(statements):
+    def apply(apps, schema_editor):
+        for sql in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+    return apply
+
+
+def populate(apps, schema_editor):
+    SearchDocument = apps.get_model('search', 'SearchDocument')
+    Post = apps.get_model('post', 'Post')
+    Food = apps.get_model('menu', 'Food')
+    User = apps.get_model('accounts', 'User')
+
+    documents = []
+    for post in Post.objects.select_related('food').iterator():
+        body = f"{post.caption or ''} {post.food.name if post.food_id else ''}"
+        documents.append(SearchDocument(kind='post', object_id=post.id, body=body.strip()))
+    for food in Food.objects.iterator():
+        documents.append(SearchDocument(kind='food', object_id=food.id, body=f"{food.name} {food.description}".strip()))
+    for user in User.objects.iterator():
+        body = f"{user.username} {user.first_name} {user.last_name}"
+        documents.append(SearchDocument(kind='user', object_id=user.id, body=body.strip()))
+
+    SearchDocument.objects.bulk_create(documents, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+        ('post', '0005_post_trending_score'),
+        ('menu', '0004_food_updated_at_menuitems_updated_at'),
+        ('accounts', '0002_create_superuser'),
+    ]
+
+    operations = [
+        migrations.RunPython(run(FORWARD), run(BACKWARD)),
+        migrations.RunPython(populate, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+from django.db import models
+
+# Create your models here.
+
+
+class SearchDocument(models.Model):
+    """
+    One searchable row per post / food / user.
+
+    The text index over `body` is created per database in migrations
+    (Postgres GIN on to_tsvector, MySQL FULLTEXT, SQLite FTS5 table),
+    see search.backends for the matching queries.
+    """
+
+    KIND_CHOICES = (
+        ('post', 'Post'),
+        ('food', 'Food'),
+        ('user', 'User'),
+    )
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    body = models.TextField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "object_id"], name="search_doc_kind_object_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.object_id}"
@@ -0,0 +1,44 @@
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+
+from menu.models import Food
+from post.models import Post
+from .indexing import KIND_FOR_MODEL, index_object, reindex_posts, unindex_object
+
+# fields whose changes don't affect any indexed text
+IGNORED_UPDATES = {"last_login", "likes_count", "trending_score", "image_variants", "updated_at"}
+
+
+def reindex(sender, instance, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= IGNORED_UPDATES:
+        return
+    index_object(KIND_FOR_MODEL[sender], instance)
+
+
+def unindex(sender, instance, **kwargs):
+    unindex_object(KIND_FOR_MODEL[sender], instance.pk)
+
+
+for model in KIND_FOR_MODEL:
+    post_save.connect(reindex, sender=model, dispatch_uid=f"search_reindex_{model._meta.label}")
+    post_delete.connect(unindex, sender=model, dispatch_uid=f"search_unindex_{model._meta.label}")
+
+
+# post documents embed their food's name
+
+@receiver(post_save, sender=Food)
+def reindex_renamed_food_posts(sender, instance, **kwargs):
+    # _renamed is set by menu.signals.note_food_rename
+    if getattr(instance, "_renamed", False):
+        reindex_posts(instance.posts.all())
+
+
+@receiver(pre_delete, sender=Food)
+def note_food_posts(sender, instance, **kwargs):
+    # SET_NULL clears post.food with a bare UPDATE, so collect them first
+    instance._post_ids = list(instance.posts.values_list("id", flat=True))
+
+
+@receiver(post_delete, sender=Food)
+def reindex_deleted_food_posts(sender, instance, **kwargs):
+    reindex_posts(Post.objects.filter(id__in=getattr(instance, "_post_ids", [])))
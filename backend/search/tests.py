@@ -0,0 +1,60 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from menu.models import Food
+from post.models import Post
+from . import backends, checks
+
+User = get_user_model()
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        # documents are indexed by the post_save signals
+        self.weak = Food.objects.create(name="momo", description="plain")
+        self.strong = Food.objects.create(name="chicken momo", description="momo momo momo momo")
+        self.other = Food.objects.create(name="chowmein", description="noodles")
+
+    def test_best_match_first(self):
+        hits = backends.search("momo", ["food"], 10)
+
+        self.assertEqual([object_id for _, object_id, _ in hits], [self.strong.id, self.weak.id])
+        self.assertGreater(hits[0][2], hits[1][2])
+
+    def test_terms_are_prefix_matched_and_combined(self):
+        self.assertEqual(backends.search_ids("chick mom", "food", 10), [self.strong.id])
+        self.assertEqual(backends.search_ids("nood", "food", 10), [self.other.id])
+        self.assertEqual(backends.search_ids("pizza", "food", 10), [])
+
+    def test_search_view_pages_ranked_hits(self):
+        client = APIClient()
+        first = client.get("/api/search/?q=momo&type=food&page_size=1").json()
+        second = client.get(first["next"]).json()
+
+        self.assertEqual([hit["id"] for hit in first["results"] + second["results"]], [self.strong.id, self.weak.id])
+        self.assertEqual(first["results"][0]["data"]["name"], "chicken momo")
+
+    def test_unsupported_database_is_refused(self):
+        with mock.patch.dict(backends.QUERIES, clear=True):
+            self.assertEqual([error.id for error in checks.check_database_vendor(None)], ["search.E001"])
+            with self.assertRaises(ImproperlyConfigured):
+                backends.search("momo", ["food"], 10)
+
+        self.assertEqual(checks.check_database_vendor(None), [])
+
+    def test_renaming_a_food_reindexes_its_posts(self):
+        author = User.objects.create_user(username="author", email="author@example.com", password="x")
+        post = Post.objects.create(user=author, caption="lunch", food=self.other)
+
+        self.other.name = "thukpa"
+        self.other.save()
+        self.assertEqual(backends.search_ids("thukpa", "post", 10), [post.id])
+        self.assertEqual(backends.search_ids("chowmein", "post", 10), [])
+
+        self.other.delete()
+        self.assertEqual(backends.search_ids("thukpa", "post", 10), [])
+        self.assertEqual(backends.search_ids("lunch", "post", 10), [post.id])
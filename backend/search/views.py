@@ -0,0 +1,96 @@
+from django.contrib.auth import get_user_model
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param, remove_query_param
+from rest_framework.views import APIView
+
+from menu.models import Food
+from menu.serializers import FoodSerializer
+from post.models import Post
+from post.serializers import PostSerializer, PostUserSerializer
+from post.viewer_state import post_serializer_context
+from .backends import search
+
+User = get_user_model()
+
+KINDS = ("post", "food", "user")
+
+
+class SearchView(APIView):
+    """
+    GET /api/search/?q=momo&type=post,food&page=2&page_size=20
+
+    One ranked list across posts, foods and users; each hit carries its
+    kind, id, score and the serialized object.
+    """
+
+    permission_classes = [permissions.AllowAny]
+    page_size = 20
+    max_page_size = 50
+
+    def get(self, request):
+        query = request.query_params.get("q", "").strip()
+
+        kinds = [
+            kind for kind in request.query_params.get("type", ",".join(KINDS)).split(",")
+            if kind in KINDS
+        ]
+
+        page_size = self.get_int("page_size", self.page_size, maximum=self.max_page_size)
+        page = self.get_int("page", 1)
+        offset = (page - 1) * page_size
+
+        hits = search(query, kinds, page_size + 1, offset)
+        has_next = len(hits) > page_size
+        hits = hits[:page_size]
+
+        objects = self.load_objects(request, hits)
+        results = [
+            {"type": kind, "id": object_id, "score": score, "data": objects[kind][object_id]}
+            for kind, object_id, score in hits
+            if object_id in objects[kind]
+        ]
+
+        url = request.build_absolute_uri()
+        return Response({
+            "next": replace_query_param(url, "page", page + 1) if has_next else None,
+            "previous": (
+                None if page == 1
+                else remove_query_param(url, "page") if page == 2
+                else replace_query_param(url, "page", page - 1)
+            ),
+            "results": results,
+        })
+
+    def get_int(self, name, default, maximum=None):
+        try:
+            value = int(self.request.query_params[name])
+        except (KeyError, ValueError):
+            return default
+        if value < 1:
+            return default
+        return min(value, maximum) if maximum else value
+
+    def load_objects(self, request, hits):
+        """One query per kind for the whole page, serialized by id."""
+        ids = {kind: [] for kind in KINDS}
+        for kind, object_id, _ in hits:
+            ids[kind].append(object_id)
+
+        objects = {kind: {} for kind in KINDS}
+
+        if ids["post"]:
+            posts = list(Post.objects.select_related("user__profile").filter(id__in=ids["post"]))
+            data = PostSerializer(posts, many=True, context=post_serializer_context(request, posts)).data
+            objects["post"] = {item["id"]: item for item in data}
+
+        if ids["food"]:
+            data = FoodSerializer(Food.objects.filter(id__in=ids["food"]), many=True).data
+            objects["food"] = {item["id"]: item for item in data}
+
+        if ids["user"]:
+            users = User.objects.select_related("profile").filter(id__in=ids["user"])
+            data = PostUserSerializer(users, many=True).data
+            objects["user"] = {item["id"]: item for item in data}
+
+        return objects
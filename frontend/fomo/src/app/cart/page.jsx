@@ -13,7 +13,7 @@ import {
   XCircle,
   ChefHat,
 } from "lucide-react";
-import { apiFetch } from "../lib/api";
+import { apiFetch, apiFetchAll } from "../lib/api";
 import { useAuth } from "@/context/AuthContext";
 import { motion, AnimatePresence } from 'motion/react';
 
@@ -48,7 +48,7 @@ export default function CartPage() {
       
       const [cartData, menuData] = await Promise.all([
         apiFetch("cart/"),
-        apiFetch("menu/menu-items"),
+        apiFetchAll("menu/menu-items"),
       ]);
 
       setCart(cartData);
@@ -66,8 +66,8 @@ export default function CartPage() {
       setLoading(true);
       setError(null);
       
-      const ordersData = await apiFetch("orders/my");
-      setOrders(ordersData.reverse());
+      const ordersData = await apiFetch("orders/my/");
+      setOrders(ordersData.results);
       console.log(ordersData)
     } catch (err) {
       setError("Failed to load orders");
@@ -91,18 +91,18 @@ export default function CartPage() {
         menu_item_id: item.menu_item,
         quantity: item.quantity,
         food_name: item.food_name,
-        price: parseFloat(item.price),
+        price: item.price === null ? 0 : parseFloat(item.price),
         image: menuItem?.image,
-        available: menuItem?.available,
-        subtotal: parseFloat(item.price) * item.quantity,
+        available: item.available,
+        subtotal: item.subtotal === null ? 0 : parseFloat(item.subtotal),
       };
     });
   }, [cart, menuItems]);
 
-  /* ---------------- CALCULATE TOTAL ---------------- */
+  /* ---------------- TOTAL (priced by the server) ---------------- */
   const cartTotal = useMemo(() => {
-    return mergedItems.reduce((sum, item) => sum + item.subtotal, 0);
-  }, [mergedItems]);
+    return cart?.total ? parseFloat(cart.total) : 0;
+  }, [cart]);
 
   /* ---------------- UPDATE QUANTITY ---------------- */
   const updateQuantity = async (itemId, newQuantity) => {
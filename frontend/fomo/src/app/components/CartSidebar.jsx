@@ -47,12 +47,9 @@ export default function CartSidebar  ({ isOpen, onClose }) {
     }
   };
 
-  // Calculate total
+  // Total is priced by the server (unavailable items excluded)
   const calculateTotal = () => {
-    if (!cartData?.items) return 0;
-    return cartData.items.reduce((total, item) => {
-      return total + (parseFloat(item.menu_item.price) * item.quantity);
-    }, 0);
+    return cartData?.total ? parseFloat(cartData.total) : 0;
   };
 
   // Fetch cart when sidebar opens
@@ -170,7 +167,7 @@ export default function CartSidebar  ({ isOpen, onClose }) {
 
                       {/* Price */}
                       <p className="text-sm font-semibold mb-3" style={{ color: '#FF6B35' }}>
-                        ₹{parseFloat(item.price).toFixed(0)} each
+                        ₹{(item.price === null ? 0 : parseFloat(item.price)).toFixed(0)} each
                       </p>
 
                       {/* Quantity Controls */}
@@ -203,7 +200,9 @@ export default function CartSidebar  ({ isOpen, onClose }) {
                         </button>
 
                         <span className="ml-auto font-semibold text-gray-800">
-                          ₹{(parseFloat(item.price) * item.quantity).toFixed(0)}
+                          {item.available
+                            ? `₹${parseFloat(item.subtotal).toFixed(0)}`
+                            : 'Unavailable'}
                         </span>
                       </div>
                     </div>
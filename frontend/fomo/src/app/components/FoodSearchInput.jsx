@@ -48,16 +48,13 @@ export default function FoodSearchInput({
     searchTimeoutRef.current = setTimeout(async () => {
       setIsSearchingFood(true);
       try {
-        const data = await apiFetch(`menu/menu-items?search=${inputValue}`);
-        const query = inputValue.toLowerCase();
-
-        // STRICT FILTER: only show foods starting with typed text
-        const filtered = data.filter(item =>
-          item.food?.name?.toLowerCase().startsWith(query)
+        // prefix matches first, then close spellings
+        const foods = await apiFetch(
+          `menu/food/autocomplete/?q=${encodeURIComponent(inputValue.trim())}&limit=5`
         );
 
-        // Take first 5 results
-        setFoodSuggestions(filtered.slice(0, 5));
+        // same shape as a menu item, which is what onFoodSelect hands out
+        setFoodSuggestions(foods.map(food => ({ id: food.id, food })));
       } catch (error) {
         console.error('Error searching foods:', error);
         setFoodSuggestions([]);
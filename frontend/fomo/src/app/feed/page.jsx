@@ -13,7 +13,9 @@ import { getMediaUrl } from '../lib/getMediaUrl';
 export default function FeedPage({ userId = null }) {
   const { user, userLoading } = useAuth();
   const [posts, setPosts] = useState([]);
+  const [nextUrl, setNextUrl] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState(null);
 
   // Add userId to dependency array
@@ -36,7 +38,8 @@ export default function FeedPage({ userId = null }) {
         : 'posts/';  // Get all posts
       
       const data = await apiFetch(endpoint);
-      setPosts(data);
+      setPosts(data.results);
+      setNextUrl(data.next);
     } catch (err) {
       console.error('Failed to fetch feed:', err);
       setError('Failed to load feed. Please try again.');
@@ -45,6 +48,25 @@ export default function FeedPage({ userId = null }) {
     }
   };
 
+  // Follow the feed's `next` cursor and append the older posts
+  const loadMore = async () => {
+    if (!nextUrl || loadingMore) return;
+
+    try {
+      setLoadingMore(true);
+      const data = await apiFetch(nextUrl);
+      setPosts(current => {
+        const seen = new Set(current.map(post => post.id));
+        return [...current, ...data.results.filter(post => !seen.has(post.id))];
+      });
+      setNextUrl(data.next);
+    } catch (err) {
+      console.error('Failed to load more posts:', err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handlePostCreated = (newPost) => {
     // Add new post to the top of the feed
     // Only add if we're on the main feed or if it's the current user's post
@@ -140,7 +162,7 @@ export default function FeedPage({ userId = null }) {
                 key={post.id}
                 initial={{ opacity: 0, y: 30 }}
                 animate={{ opacity: 1, y: 0 }}
-                transition={{ delay: index * 0.1, duration: 0.4 }}
+                transition={{ delay: (index % 20) * 0.1, duration: 0.4 }}
               >
                 <PostCard
                   post={post}
@@ -157,8 +179,22 @@ export default function FeedPage({ userId = null }) {
           </div>
         )}
 
-        {/* Load More (Future enhancement) */}
-        {!loading && posts.length > 0 && (
+        {/* Load More */}
+        {!loading && !error && nextUrl && (
+          <div className="text-center mt-12">
+            <button
+              onClick={loadMore}
+              disabled={loadingMore}
+              className="inline-flex items-center gap-2 px-6 py-3 bg-gradient-to-r from-[#FF6B35] to-[#E55A25] text-white rounded-xl hover:shadow-[0_6px_20px_rgba(255,107,53,0.4)] transition-all font-['Poppins'] disabled:opacity-60"
+              style={{ fontWeight: 600 }}
+            >
+              {loadingMore && <Loader2 size={18} className="animate-spin" />}
+              {loadingMore ? 'Loading...' : 'Load More'}
+            </button>
+          </div>
+        )}
+
+        {!loading && !nextUrl && posts.length > 0 && (
           <motion.div
             initial={{ opacity: 0 }}
             animate={{ opacity: 1 }}
@@ -1,7 +1,9 @@
 const API_BASE = process.env.NEXT_PUBLIC_API_URL || "http://127.0.0.1:8000/api/";
 
 export async function apiFetch(endpoint, options = {}) {
-  const res = await fetch(API_BASE + endpoint, {
+  // paginated responses link to absolute `next` / `previous` URLs
+  const url = /^https?:\/\//.test(endpoint) ? endpoint : API_BASE + endpoint;
+  const res = await fetch(url, {
     credentials: "include", 
     headers: {
       "Content-Type": "application/json",
@@ -21,3 +23,15 @@ export async function apiFetch(endpoint, options = {}) {
    const text = await res.text();
   return text ? JSON.parse(text) : {};
 }
+
+// Every row of a paginated list endpoint, following `next` links.
+export async function apiFetchAll(endpoint, options = {}) {
+  let data = await apiFetch(endpoint, options);
+  const results = [...(data.results || [])];
+
+  while (data.next) {
+    data = await apiFetch(data.next, options);
+    results.push(...(data.results || []));
+  }
+  return results;
+}
@@ -3,7 +3,7 @@
 import React, { useState, useEffect } from 'react';
 import { Search } from 'lucide-react';
 import MenuItemCard from '../components/MenuItemCard';
-import { apiFetch } from '@/app/lib/api';
+import { apiFetchAll } from '@/app/lib/api';
 
 const FoMoMenu = () => {
   const [menuItems, setMenuItems] = useState([]);
@@ -17,7 +17,7 @@ const FoMoMenu = () => {
   useEffect(() => {
     const fetchMenuItems = async () => {
       try {
-        const data = await apiFetch('menu/menu-items');
+        const data = await apiFetchAll('menu/menu-items');
         setMenuItems(data);
         setFilteredItems(data);
       } catch (err) {